@@ -0,0 +1,512 @@
+# app_async.py — aynı API'nin ASGI sürümü (FastAPI + asyncpg)
+#
+# app.py (Flask) her isteği bir thread'de bloklayarak çalıştırır; yavaş bir
+# geometri sorgusu (ör. burn-areas?mode=polys) thread'i ve DB bağlantısını
+# süre boyunca tutar. Burada sorgular asyncpg havuzunda await edilir: tek
+# event loop, bekleyen sorgular ucuz istekleri (health, route) bloklamaz.
+#
+#   - SQL, parametre ayrıştırma, config: app.py ile ortak (route_sql,
+#     features_sql, *_body, parse_*) -> iki sunucu aynı yanıtı üretir
+#   - psycopg2 %(ad)s parametreleri asyncpg $n'e çevrilir (to_asyncpg)
+#   - rota sorguları app.QUERIES'teki hazır metinle gider; asyncpg bağlantı
+#     başına statement önbelleğiyle zaten PREPARE eder
+#   - önbellek + ETag / 304 ve br/gzip sıkıştırma Flask sürümüyle aynı
+#   - Server-Timing, /metrics ve yavaş sorgu logu Flask sürümüyle ortak
+#     (request_timing; köprülenen Flask uçları kendilerini ölçer)
+#   - burada olmayan uçlar (route-batch, point-risk, tiles) Flask
+#     uygulamasına WSGI köprüsüyle devredilir (thread havuzunda)
+#
+# Çalıştırma:
+#   uvicorn app_async:api --host 127.0.0.1 --port 5001 --workers 2
+#   python app_async.py
+
+import os
+import json
+import time
+import gzip
+import asyncio
+import hashlib
+from functools import wraps, lru_cache
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime, format_datetime
+
+import asyncpg
+from fastapi import FastAPI, Request
+from fastapi.responses import Response, StreamingResponse
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    from starlette.middleware.wsgi import WSGIMiddleware
+
+import request_timing
+from request_timing import phase
+from query_registry import to_positional
+from db_pool import PoolTimeout
+from dataset_version import BURN_POLYS, BURN_UNION, ASSEMBLY_AREAS
+from app import (
+    app as flask_app, brotli, response_cache, DecimalEncoder,
+    DATABASE_URL, POSTGIS_SCHEMA,
+    DB_POOL_MIN, DB_POOL_MAX, DB_POOL_TIMEOUT, DB_POOL_RETRY_AFTER, DATASET_VERSION_TTL, STREAM_ITERSIZE,
+    COMPRESSIBLE, COMPRESS_MIN_BYTES, COMPRESS_LEVEL,
+    HOST, PORT,
+    ROUTE_TO_FIRE, ROUTE_TO_ASSEMBLY, ROUTE_TO_ASSEMBLY_K, route_metric_column, features_sql,
+    burn_areas_table, burn_areas_body, TABLE_COLUMNS_SQL, assembly_areas_body, BURN_SUMMARY_SQL,
+    BURN_AREAS_TARGET, BURN_POLYS_TARGET, ASSEMBLY_TARGET, burn_target_table,
+    parse_route_args, parse_k, parse_bbox, parse_stream_format, parse_tolerance, parse_limit_zoom,
+)
+
+ASYNC_PORT = int(os.getenv("ASYNC_PORT", str(PORT + 1)))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# DB helpers
+# ──────────────────────────────────────────────────────────────────────────────
+
+_pool = None
+_pool_lock = asyncio.Lock()
+
+async def get_pool():
+    """asyncpg havuzunu ilk kullanımda oluştur (import / startup sırasında DB'ye bağlanma)."""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(DATABASE_URL, min_size=DB_POOL_MIN, max_size=DB_POOL_MAX)
+    return _pool
+
+@asynccontextmanager
+async def lifespan(_):
+    yield
+    if _pool is not None:
+        await _pool.close()
+
+api = FastAPI(title="afet API (ASGI)", lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+
+_convert = lru_cache(maxsize=256)(to_positional)
+
+def to_asyncpg(sql, params=None):
+    """
+    psycopg2 %(ad)s -> asyncpg $n (aynı ad aynı numara). Ortak SQL'de parametreler
+    açıkça cast edilir (%(x)s::float8) ki asyncpg tipleri çıkarabilsin.
+    Dönüş: (sql, args)
+    """
+    sql, names = _convert(sql)
+    return sql, [(params or {})[n] for n in names]
+
+async def acquire(pool):
+    """pool.acquire; checkout zaman aşımı Flask'taki gibi PoolTimeout (-> 503)."""
+    with phase("db-conn"):
+        try:
+            return await pool.acquire(timeout=DB_POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise PoolTimeout(f"{DB_POOL_TIMEOUT:.1f} sn içinde veritabanı bağlantısı alınamadı "
+                              f"(max={DB_POOL_MAX}).") from None
+
+async def _run(method, sql, params):
+    """Havuzdan bağlantı al + sorgu; db-conn / db-exec fazları ve yavaş sorgu kontrolü."""
+    q, args = to_asyncpg(sql, params)
+    pool = await get_pool()
+    conn = await acquire(pool)
+    try:
+        t0 = time.perf_counter()
+        with phase("db-exec"):
+            result = await getattr(conn, method)(q, *args)
+        request_timing.check_slow(sql, params, time.perf_counter() - t0)
+        return result
+    finally:
+        await pool.release(conn)
+
+async def fetchrow(sql, params=None):
+    return await _run("fetchrow", sql, params)
+
+async def fetch(sql, params=None):
+    return await _run("fetch", sql, params)
+
+async def stream_query(sql, params=None):
+    """
+    Cursor ile satırları parça parça oku (app.stream_query karşılığı). Bağlantı
+    iterator'ın içinde alınır ve iterator ilk parçaya kadar burada ilerletilir:
+    havuz / sorgu hatası yanıt başlamadan yükselir (503 / 400). Bağlantı
+    iterator'ın finally'sinde iade edilir: bitince, istemci kopunca (iptal)
+    ya da yanıt hiç gönderilmeden bırakılınca (asyncio async generator
+    finalizer'ı aclose çağırır) — iterate edilmeyen yanıt bağlantı sızdırmaz.
+    """
+    q, args = to_asyncpg(sql, params)
+    pool = await get_pool()
+
+    async def rows():
+        conn = await acquire(pool)
+        tr = conn.transaction(readonly=True)
+        try:
+            await tr.start()
+            with phase("db-exec"):
+                cur = await conn.cursor(q, *args)
+                batch = await cur.fetch(STREAM_ITERSIZE)
+            yield None                                  # hazır: ilk parça okundu
+            while batch:
+                for r in batch:
+                    yield r
+                batch = await cur.fetch(STREAM_ITERSIZE)
+        finally:
+            # iptal edilen görevde de iade tamamlansın
+            await asyncio.shield(_finish(pool, conn, tr))
+
+    it = rows()
+    await it.__anext__()
+    return it
+
+async def _finish(pool, conn, tr):
+    try:
+        await tr.rollback()
+    except Exception:
+        pass
+    await pool.release(conn)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Responses
+# ──────────────────────────────────────────────────────────────────────────────
+
+def accepted_encoding(request, mimetype=None, size=None):
+    """app.accepted_encoding karşılığı: "br" | "gzip" | None."""
+    if mimetype is not None and (mimetype not in COMPRESSIBLE or size < COMPRESS_MIN_BYTES):
+        return None
+    accept = request.headers.get("accept-encoding", "").lower()
+    if brotli is not None and "br" in accept:
+        return "br"
+    if "gzip" in accept:
+        return "gzip"
+    return None
+
+def respond(request, body, status=200, mimetype="application/json", headers=None,
+            cache_key=None, encoding=None):
+    """
+    app.compress ile aynı: Accept-Encoding'e göre br/gzip (COMPRESS_MIN_BYTES üstü).
+    encoding verilirse body zaten o şekilde sıkıştırılmıştır (önbellek isabeti);
+    cache_key verilirse üretilen sıkıştırılmış varyant (cache_key, encoding) ile saklanır.
+    """
+    headers = dict(headers or {})
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    # cached içinde çağrılan view gövdeyi sıkıştırmaz: önbelleğe ham gövde girer
+    if status == 200 and mimetype in COMPRESSIBLE and not getattr(request.state, "raw_body", False):
+        headers["Vary"] = "Accept-Encoding"
+        if encoding is None:
+            encoding = accepted_encoding(request, mimetype, len(body))
+            if encoding is not None:
+                with phase("compress"):
+                    if encoding == "br":
+                        body = brotli.compress(body, quality=COMPRESS_LEVEL)
+                    else:
+                        body = gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+                if cache_key is not None:
+                    response_cache.put((cache_key, encoding), body, mimetype)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            if "ETag" in headers and not headers["ETag"].startswith("W/"):
+                headers["ETag"] = "W/" + headers["ETag"]
+    return Response(content=body, status_code=status, media_type=mimetype, headers=headers)
+
+def ok(request, data, status=200):
+    with phase("encode"):
+        body = json.dumps(data, cls=DecimalEncoder, ensure_ascii=False)
+    return respond(request, body, status)
+
+def bad_request(request, msg, status=400):
+    return ok(request, {"error": msg}, status=status)
+
+def service_unavailable(request, msg):
+    resp = ok(request, {"error": msg}, status=503)
+    resp.headers["Retry-After"] = str(DB_POOL_RETRY_AFTER)
+    return resp
+
+def db_error(request, msg, e):
+    """app.db_error karşılığı: PoolTimeout -> 503 + Retry-After, diğerleri -> 400."""
+    if isinstance(e, PoolTimeout):
+        return service_unavailable(request, f"{msg}: {e}")
+    return bad_request(request, f"{msg}: {e}")
+
+@api.exception_handler(PoolTimeout)
+async def pool_timeout(request: Request, e):
+    return service_unavailable(request, str(e))
+
+def stream_features(rows, fmt):
+    """app.stream_features karşılığı: (id, geometry_text, props_text) satırları."""
+    def feature(r):
+        fid, geom, props = r
+        return f'{{"type":"Feature","id":{json.dumps(fid)},"geometry":{geom or "null"},"properties":{props or "{}"}}}'
+
+    async def gen_fc():
+        yield '{"type":"FeatureCollection","features":['
+        sep = ""
+        async for r in rows:
+            yield sep + feature(r)
+            sep = ","
+        yield "]}"
+
+    async def gen_seq():
+        async for r in rows:
+            yield "\x1e" + feature(r) + "\n"
+
+    if fmt == "seq":
+        return StreamingResponse(gen_seq(), media_type="application/geo+json-seq")
+    return StreamingResponse(gen_fc(), media_type="application/geo+json")
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Response cache (app.cached ile aynı anahtar / ETag / 304)
+# ──────────────────────────────────────────────────────────────────────────────
+
+_versions = {"at": None, "data": {}}
+
+async def dataset_versions():
+    """{name: (version, updated_at)} — TTL ile; tablo yoksa None (app.dataset_versions)."""
+    at = _versions["at"]
+    if at is not None and time.monotonic() - at < DATASET_VERSION_TTL:
+        return _versions["data"]
+    try:
+        rows = await fetch(f'SELECT name, version, updated_at FROM {POSTGIS_SCHEMA}."dataset_versions"')
+        data = {r["name"]: (r["version"], r["updated_at"]) for r in rows}
+    except asyncpg.UndefinedTableError:
+        data = None
+    _versions["at"] = time.monotonic()
+    _versions["data"] = data
+    return data
+
+_columns = {}
+
+async def table_columns(table):
+    """app.table_columns karşılığı (DATASET_VERSION_TTL ile önbellekli)."""
+    hit = _columns.get(table)
+    if hit is not None and time.monotonic() - hit[0] < DATASET_VERSION_TTL:
+        return hit[1]
+    rows = await fetch(TABLE_COLUMNS_SQL, {"table": table})
+    cols = frozenset(r["attname"] for r in rows)
+    _columns[table] = (time.monotonic(), cols)
+    return cols
+
+async def optional_columns(table):
+    """app.optional_columns karşılığı."""
+    try:
+        return await table_columns(table)
+    except PoolTimeout:
+        raise
+    except Exception:
+        return None
+
+async def fire_table_columns():
+    """app.fire_table_columns karşılığı."""
+    return await optional_columns(BURN_AREAS_TARGET)
+
+def _etag_matches(header, etag):
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or any(t.removeprefix("W/").strip('"') == etag for t in tags)
+
+def cached(datasets):
+    def deco(view):
+        @wraps(view)
+        async def wrapper(request: Request):
+            try:
+                versions = await dataset_versions()
+            except PoolTimeout:
+                raise
+            except Exception:
+                return await view(request)
+
+            stamps = [versions.get(name) for name in datasets] if versions is not None else [None]
+            if None in stamps:
+                return await view(request)             # app.cached gibi: versiyonsuz -> önbellek yok
+            params = sorted(request.query_params.multi_items())
+            key = json.dumps([request.url.path, params, [s[0] for s in stamps]])
+            etag = hashlib.sha1(key.encode("utf-8")).hexdigest()
+            last_modified = max((s[1] for s in stamps), default=None)
+
+            headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+            if last_modified is not None:
+                headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+            inm = request.headers.get("if-none-match")
+            ims = request.headers.get("if-modified-since")
+            if inm:
+                not_modified = _etag_matches(inm, etag)
+            else:
+                try:
+                    not_modified = (ims is not None and last_modified is not None
+                                    and parsedate_to_datetime(ims) >= last_modified.replace(microsecond=0))
+                except (TypeError, ValueError):
+                    not_modified = False
+            if not_modified:
+                return Response(status_code=304, headers=headers)
+
+            # app.cached gibi: sıkıştırılmış varyant (anahtar, encoding) ile saklanır
+            preferred = accepted_encoding(request)
+            keys = ((key, preferred), key) if preferred is not None else (key,)
+            hit_key, hit = response_cache.get_first(keys)
+            if hit is not None and hit_key != key:
+                body, mimetype = hit
+                return respond(request, body, mimetype=mimetype, headers=headers, encoding=preferred)
+
+            if hit is not None:
+                body, mimetype = hit
+                return respond(request, body, mimetype=mimetype, headers=headers, cache_key=key)
+
+            request.state.raw_body = True
+            try:
+                resp = await view(request)
+            finally:
+                request.state.raw_body = False
+            if resp.status_code != 200 or isinstance(resp, StreamingResponse):
+                return resp
+            response_cache.put(key, resp.body, resp.media_type)
+            return respond(request, resp.body, mimetype=resp.media_type, headers=headers, cache_key=key)
+        return wrapper
+    return deco
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Timing (Server-Timing + histogramlar; app.server_timing karşılığı)
+# ──────────────────────────────────────────────────────────────────────────────
+
+@api.middleware("http")
+async def server_timing(request: Request, call_next):
+    ctx = request_timing.start()
+    resp = await call_next(request)
+    route = request.scope.get("route")
+    if route is None:
+        return resp                     # Flask'a köprülenen uç: kendi after_request'i ölçer
+    ctx["route"] = route.path
+    if "server-timing" not in resp.headers:
+        resp.headers["Server-Timing"] = request_timing.server_timing(ctx)
+    request_timing.observe(ctx, request.method, resp.status_code)
+    return resp
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Routes
+# ──────────────────────────────────────────────────────────────────────────────
+
+@api.get("/health")
+async def health(request: Request):
+    pool = _pool
+    return ok(request, {
+        "status": "ok",
+        "server": "asgi",
+        "pool": None if pool is None else {
+            "size": pool.get_size(),
+            "idle": pool.get_idle_size(),
+            "min": pool.get_min_size(),
+            "max": pool.get_max_size(),
+        },
+        "cache": response_cache.stats(),
+    })
+
+@api.get("/metrics")
+async def metrics(request: Request):
+    """Prometheus metin formatı (app.metrics karşılığı; asyncpg havuzu + bu sürecin histogramları)."""
+    gauges = {}
+    pool = _pool
+    if pool is not None:
+        gauges["afet_db_pool_connections"] = ("Havuz bağlantıları (asyncpg)", {
+            (("state", "open"),): pool.get_size(),
+            (("state", "idle"),): pool.get_idle_size(),
+            (("state", "in_use"),): pool.get_size() - pool.get_idle_size(),
+        })
+    cs = response_cache.stats()
+    gauges["afet_response_cache"] = ("Yanıt önbelleği", {
+        (("stat", k),): cs[k] for k in ("entries", "bytes", "hits", "misses", "evictions")})
+    return Response(content=request_timing.render_metrics(gauges),
+                    media_type="text/plain; version=0.0.4")
+
+@api.get("/api/burn-areas")
+@cached(datasets=(BURN_POLYS, BURN_UNION))
+async def burn_areas(request: Request):
+    """app.burn_areas ile aynı parametreler (mode, tolerance, format)."""
+    args = request.query_params
+    mode = (args.get("mode") or "union").lower()
+    fmt, err = parse_stream_format(args)
+    if err:
+        return bad_request(request, err)
+    tolerance, err = parse_tolerance(args)
+    if err:
+        return bad_request(request, err)
+
+    try:
+        columns = await table_columns(burn_areas_table(mode))
+        sql = features_sql(burn_areas_body(mode, tolerance, columns), "_fid", fmt)
+        if fmt != "geojson":
+            return stream_features(await stream_query(sql), fmt)
+        row = await fetchrow(sql)
+        return respond(request, row["fc"])
+    except Exception as e:
+        return db_error(request, "Yanık alanları okunamadı", e)
+
+async def _route(request, query, **extra):
+    params, err = parse_route_args(request.query_params)
+    if err:
+        return bad_request(request, err)
+    params.update(extra)
+    try:
+        row = await fetchrow(query.sql, params)
+        return respond(request, row["fc"])
+    except Exception as e:
+        return db_error(request, "Rota hesaplanamadı", e)
+
+@api.get("/api/route-to-fire")
+async def route_to_fire(request: Request):
+    burn_table, err = burn_target_table(request.query_params, await fire_table_columns())
+    if err:
+        return bad_request(request, err)
+    metric_col = route_metric_column(await optional_columns(burn_table))
+    return await _route(request, ROUTE_TO_FIRE[burn_table][metric_col])
+
+@api.get("/api/route-to-assembly")
+async def route_to_assembly(request: Request):
+    """app.route_to_assembly ile aynı (?k= adaylar)."""
+    k, err = parse_k(request.query_params)
+    if err:
+        return bad_request(request, err)
+    assembly_cols = await optional_columns(ASSEMBLY_TARGET)
+    if k is None:
+        return await _route(request, ROUTE_TO_ASSEMBLY[route_metric_column(assembly_cols)])
+    metric_col = route_metric_column(assembly_cols, await optional_columns(BURN_POLYS_TARGET))
+    return await _route(request, ROUTE_TO_ASSEMBLY_K[metric_col], k=k)
+
+@api.get("/api/assembly-areas")
+@cached(datasets=(ASSEMBLY_AREAS,))
+async def assembly_areas(request: Request):
+    """app.assembly_areas ile aynı parametreler (bbox, limit, zoom, format)."""
+    args = request.query_params
+    bbox, err = parse_bbox(args)
+    if err:
+        return bad_request(request, err)
+    fmt, err = parse_stream_format(args)
+    if err:
+        return bad_request(request, err)
+    limit, zoom, err = parse_limit_zoom(args)
+    if err:
+        return bad_request(request, err)
+
+    body_sql, params = assembly_areas_body(bbox, limit, zoom)
+    sql = features_sql(body_sql, "id", fmt)
+    try:
+        if fmt != "geojson":
+            return stream_features(await stream_query(sql, params), fmt)
+        row = await fetchrow(sql, params)
+        return respond(request, row["fc"])
+    except Exception as e:
+        return db_error(request, "Toplanma alanları okunamadı", e)
+
+@api.get("/api/burn-summary")
+@cached(datasets=(BURN_POLYS,))
+async def burn_summary(request: Request):
+    try:
+        rows = await fetch(BURN_SUMMARY_SQL)
+        return ok(request, {"summary": [dict(r) for r in rows]})
+    except Exception as e:
+        return db_error(request, "Özet hesaplanamadı", e)
+
+# Geri kalan uçlar (route-batch, point-risk, tiles) -> Flask (thread havuzunda)
+api.mount("/", WSGIMiddleware(flask_app))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Entry
+# ──────────────────────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("app_async:api", host=HOST, port=ASYNC_PORT)
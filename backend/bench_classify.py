@@ -0,0 +1,85 @@
+# bench_classify.py — sınıflandırma çekirdeği mikro-benchmark'ı
+#
+# dnbr_classes.classify (dnbr.py / verify_dnbr.py / dnbr_old.py'nin kullandığı
+# tek geçişli çekirdek) ve dnbr_classes.nbr Landsat boyutunda (varsayılan
+# 7801 x 7931) bir float32 dNBR dizisinde ölçülür. Karşılaştırma tabanı
+# olarak kaldırılan maske tabanlı sınıflandırma (5 boolean maske + 5 dağıtma)
+# ve eski safe_div yalnızca bu dosyada referans kopya olarak durur
+# (classify_masks, safe_div_old); sonuçların birebir aynı olduğu doğrulanır.
+#
+# Kullanım:
+#   python bench_classify.py
+#   python bench_classify.py --rows 4000 --cols 4000 --repeat 5
+
+import time, argparse
+import numpy as np
+
+from dnbr_classes import classify, nbr
+
+def classify_masks(dnbr):
+    """Referans kopya: kaldırılan maske tabanlı sınıflandırma (maske başına bir geçiş)."""
+    classes = np.full(dnbr.shape, 255, dtype="uint8")
+    mask = ~np.isnan(dnbr)
+    bins = [0.10, 0.27, 0.44, 0.66]
+    classes[mask & (dnbr < bins[0])] = 0
+    classes[mask & (dnbr >= bins[0]) & (dnbr < bins[1])] = 1
+    classes[mask & (dnbr >= bins[1]) & (dnbr < bins[2])] = 2
+    classes[mask & (dnbr >= bins[2]) & (dnbr < bins[3])] = 3
+    classes[mask & (dnbr >= bins[3])] = 4
+    return classes
+
+def safe_div_old(a, b):
+    """Referans kopya: kaldırılan safe_div (3 tam boy geçici dizi)."""
+    return (a - b) / np.where(np.abs(a + b) < 1e-6, np.nan, (a + b))
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, res
+
+def main():
+    parser = argparse.ArgumentParser(description="dNBR sınıflandırma mikro-benchmark")
+    parser.add_argument("--rows", type=int, default=7801)
+    parser.add_argument("--cols", type=int, default=7931)
+    parser.add_argument("--nan-frac", type=float, default=0.2, help="NaN (nodata) oranı")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shape = (args.rows, args.cols)
+    mpx = args.rows * args.cols / 1e6
+    print(f"[INFO] Dizi: {shape[0]} x {shape[1]} float32 ({mpx:.1f} Mpx)")
+
+    dnbr = rng.uniform(-0.5, 1.2, shape).astype("float32")
+    dnbr[rng.random(shape) < args.nan_frac] = np.nan
+
+    t_old, ref = best_of(lambda: classify_masks(dnbr), args.repeat)
+    out = np.empty(shape, dtype="uint8")
+    t_new, res = best_of(lambda: classify(dnbr, "usgs5", out=out), args.repeat)
+    if not np.array_equal(ref, res):
+        raise SystemExit("HATA: sonuçlar farklı!")
+
+    print(f"\n{'sınıflandırma':<22} {'süre (s)':>10} {'Mpx/s':>10}")
+    print(f"{'maskeler (eski)':<22} {t_old:>10.3f} {mpx / t_old:>10.1f}")
+    print(f"{'tek geçiş (yeni)':<22} {t_new:>10.3f} {mpx / t_new:>10.1f}")
+    print(f"Hızlanma: {t_old / t_new:.2f}x  (sonuçlar birebir aynı)")
+
+    nir = rng.uniform(0.05, 0.5, shape).astype("float32")
+    swir = rng.uniform(0.05, 0.5, shape).astype("float32")
+    t_old, ref = best_of(lambda: safe_div_old(nir, swir), args.repeat)
+    buf = np.empty(shape, dtype="float32")
+    t_new, res = best_of(lambda: nbr(nir, swir, out=buf), args.repeat)
+    if not np.allclose(ref, res, equal_nan=True):
+        raise SystemExit("HATA: NBR sonuçları farklı!")
+
+    print(f"\n{'NBR':<22} {'süre (s)':>10} {'Mpx/s':>10}")
+    print(f"{'safe_div (eski)':<22} {t_old:>10.3f} {mpx / t_old:>10.1f}")
+    print(f"{'nbr(out=) (yeni)':<22} {t_new:>10.3f} {mpx / t_new:>10.1f}")
+    print(f"Hızlanma: {t_old / t_new:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# bench_dnbr.py — dNBR motoru throughput ölçümü (megapiksel / sn)
+#
+# dnbr_tiled.run() farklı worker sayılarıyla çalıştırılır; her koşu için
+# süre ve Mpx/s yazdırılır. Bant verilmezse geçici dizinde sentetik bir sahne
+# (UTM 35N, 30 m, bir bant kaydırılmış grid -> WarpedVRT yolu da ölçülür) üretilir.
+#
+# Kullanım:
+#   python bench_dnbr.py                          # 4000x4000 sentetik, workers=1,2,4,..,nproc
+#   python bench_dnbr.py --size 8000 --workers 1 2 4 8 --json outputs/bench_dnbr.json
+#   python bench_dnbr.py --b5-before a.TIF --b7-before b.TIF --b5-after c.TIF --b7-after d.TIF
+
+import os, json, time, argparse, tempfile
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+
+import dnbr_tiled
+
+def make_synthetic(folder, size, seed=0):
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i, name in enumerate(("b5_before", "b7_before", "b5_after", "b7_after")):
+        # son bant 5 piksel kaydırılmış ve biraz büyük: hizalama gerektirir
+        shift = 5 if i == 3 else 0
+        n = size + 2 * shift
+        transform = from_origin(500000 - shift * 30, 4250000 + shift * 30, 30, 30)
+        path = os.path.join(folder, f"{name}.tif")
+        with rasterio.open(
+            path, "w", driver="GTiff", height=n, width=n, count=1, dtype="uint16",
+            crs="EPSG:32635", transform=transform, nodata=0,
+            tiled=True, blockxsize=512, blockysize=512,
+        ) as dst:
+            for row in range(0, n, 512):
+                h = min(512, n - row)
+                dst.write(rng.integers(5000, 20000, (h, n), dtype="uint16"), 1,
+                          window=rasterio.windows.Window(0, row, n, h))
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="dNBR throughput benchmark")
+    parser.add_argument("--b5-before"); parser.add_argument("--b7-before")
+    parser.add_argument("--b5-after");  parser.add_argument("--b7-after")
+    parser.add_argument("--size", type=int, default=4000, help="sentetik sahne kenarı (piksel)")
+    parser.add_argument("--block", type=int, default=512)
+    parser.add_argument("--workers", type=int, nargs="+")
+    parser.add_argument("--repeat", type=int, default=1, help="her worker sayısı için tekrar (en iyisi alınır)")
+    parser.add_argument("--json", help="sonuçları JSON olarak yaz")
+    args = parser.parse_args()
+
+    ncpu = os.cpu_count() or 1
+    workers = args.workers or sorted({1, *[w for w in (2, 4, 8, 16, 32) if w <= ncpu], ncpu})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.b5_before:
+            paths = [args.b5_before, args.b7_before, args.b5_after, args.b7_after]
+        else:
+            print(f"[INFO] Sentetik sahne: {args.size}x{args.size}")
+            paths = make_synthetic(tmp, args.size)
+        with rasterio.open(paths[0]) as ref:
+            mpx = ref.width * ref.height / 1e6
+
+        out_tif = os.path.join(tmp, "bench_out.tif")
+        results = []
+        print(f"\n{'workers':>8} {'süre (s)':>10} {'Mpx/s':>10} {'hızlanma':>10}")
+        base = None
+        for w in workers:
+            best = None
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                dnbr_tiled.run(*paths, out_tif, block=args.block, workers=w, checkpoint=10**9)
+                dt = time.perf_counter() - t0
+                best = dt if best is None else min(best, dt)
+            base = base or best
+            results.append({"workers": w, "seconds": round(best, 3), "mpx_per_s": round(mpx / best, 2)})
+            print(f"{w:>8} {best:>10.2f} {mpx / best:>10.2f} {base / best:>9.2f}x")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump({"megapixels": mpx, "block": args.block, "cpu_count": ncpu, "runs": results}, f, indent=2)
+        print("JSON:", args.json)
+
+if __name__ == "__main__":
+    main()
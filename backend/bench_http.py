@@ -0,0 +1,342 @@
+# bench_http.py — API yük testi ve gecikme benchmark'ı (sonuçlar JSON)
+#
+# Senaryolar (worker thread başına kalıcı HTTP bağlantısı, kapalı döngü):
+#   replay     -> frontend (src/App.jsx) trafiğinin tekrarı: her oturum yanık
+#                 katmanını yükler (burn-areas?mode=polys), sonra haritayı
+#                 kaydırır / yakınlaştırır (assembly-areas?bbox=, görünen alan
+#                 1280x800 px) ve tıklar (route-to-fire + route-to-assembly);
+#                 oturum bitince yenisi başlar
+#   contention -> yavaş bir geometri sorgusunun ucuz istekleri ne kadar
+#                 beklettiği: önbelleksiz burn-areas?mode=polys, rastgele
+#                 route-to-fire, /health (Flask vs ASGI karşılaştırması)
+# Uç başına p50/p95/p99 gecikme, hata sayısı, istek/sn ve yanıt boyutu
+# (sıkıştırılmış, kablodaki bayt) raporlanır ve JSON'a yazılır
+# (outputs/bench/api-<etiket>-<zaman>.json). --baseline ile önceki bir
+# sonuçla karşılaştırılır; p95, --max-regression oranından fazla kötüleşirse
+# çıkış kodu 1 olur. Ortak taban outputs/bench/baseline.json'dur:
+# --save-baseline sonucu oraya da yazar (commit'lenir), dosya varsa
+# --baseline verilmeden de onunla karşılaştırılır. Depoda henüz ölçülmüş
+# bir taban yok; ilk fikstür koşusu --save-baseline ile alınmalı.
+#
+# Sunucular elle başlatılabilir (--target) ya da bench_fixture.py'nin
+# PostGIS fikstürüne karşı otomatik açılır (--serve + --fixture / --db).
+#
+# Kullanım:
+#   python bench_http.py --fixture docker --serve flask --serve asgi -c 16 -d 30
+#   python bench_http.py --target local=http://127.0.0.1:5000 --scenario contention
+#   python bench_http.py --fixture pgctl --serve flask --baseline outputs/bench/api-abc123-....json
+#   python bench_http.py --fixture docker --serve flask --serve asgi --save-baseline
+
+import os, sys, json, time, random, socket, platform, argparse, threading, subprocess
+import http.client
+from math import cos, radians
+from collections import deque
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+import numpy as np
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BASE, "outputs", "bench")
+BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+
+START = (27.13763, 38.42762, 11)          # App.jsx DEFAULTS (lon, lat, zoom)
+ZOOM_RANGE = (10, 16)
+VIEWPORT_PX = (1280, 800)
+BBOX = (26.8, 38.25, 27.5, 38.6)          # oturumların gezindiği alan (İzmir)
+SESSION_ACTIONS = (10, 30)                # oturum başına kaydırma/tıklama sayısı
+PAN_SHARE = 0.65                          # eylemlerin kaydırma oranı (kalanı tıklama)
+CONTENTION_MIX = (("slow", 1), ("route", 4), ("cheap", 5))
+
+SERVERS = {
+    "flask": [sys.executable, "app.py"],
+    "asgi": [sys.executable, "-m", "uvicorn", "app_async:api", "--host", "127.0.0.1",
+             "--port", "{port}", "--log-level", "warning"],
+}
+
+# ----------------- senaryolar -----------------
+class ReplaySession:
+    """Tek kullanıcının harita oturumu; next() -> (uç, path)."""
+
+    def __init__(self, rnd, bbox=BBOX):
+        self.rnd, self.bbox = rnd, bbox
+        self.queue = deque()
+        self.left = 0
+
+    def view(self):
+        deg_px = 360.0 / (256 * 2 ** self.zoom)
+        half_w = deg_px * VIEWPORT_PX[0] / 2
+        half_h = deg_px * VIEWPORT_PX[1] / 2 * cos(radians(self.lat))
+        return (self.lon - half_w, self.lat - half_h, self.lon + half_w, self.lat + half_h)
+
+    def pan(self):
+        w, s, e, n = self.view()
+        return ("assembly-areas", f"/api/assembly-areas?bbox={w},{s},{e},{n}")
+
+    def start(self):
+        self.lon, self.lat, self.zoom = START
+        self.left = self.rnd.randint(*SESSION_ACTIONS)
+        self.queue.append(("burn-areas", "/api/burn-areas?mode=polys"))
+        self.queue.append(self.pan())              # UseBboxFetcher ilk görünümde de çalışır
+
+    def act(self):
+        rnd = self.rnd
+        w, s, e, n = self.view()
+        if rnd.random() < PAN_SHARE:
+            if rnd.random() < 0.25:
+                self.zoom = min(max(self.zoom + rnd.choice((-1, 1)), ZOOM_RANGE[0]), ZOOM_RANGE[1])
+            self.lon = min(max(self.lon + rnd.uniform(-0.6, 0.6) * (e - w), self.bbox[0]), self.bbox[2])
+            self.lat = min(max(self.lat + rnd.uniform(-0.6, 0.6) * (n - s), self.bbox[1]), self.bbox[3])
+            self.queue.append(self.pan())
+        else:
+            lon, lat = rnd.uniform(w, e), rnd.uniform(s, n)
+            for kind in ("fire", "assembly"):
+                self.queue.append((f"route-to-{kind}", f"/api/route-to-{kind}?lat={lat}&lon={lon}"))
+
+    def next(self):
+        while not self.queue:
+            if self.left <= 0:
+                self.start()
+            else:
+                self.left -= 1
+                self.act()
+        return self.queue.popleft()
+
+class ContentionSession:
+    def __init__(self, rnd, bbox=BBOX):
+        self.rnd, self.bbox = rnd, bbox
+        self.groups, self.weights = zip(*CONTENTION_MIX)
+
+    def next(self):
+        rnd, bbox = self.rnd, self.bbox
+        group = rnd.choices(self.groups, self.weights)[0]
+        if group == "slow":
+            return "burn-areas (no cache)", f"/api/burn-areas?mode=polys&_={rnd.getrandbits(48)}"
+        if group == "route":
+            lon, lat = rnd.uniform(bbox[0], bbox[2]), rnd.uniform(bbox[1], bbox[3])
+            return "route-to-fire", f"/api/route-to-fire?lon={lon:.5f}&lat={lat:.5f}"
+        return "health", "/health"
+
+SCENARIOS = {"replay": ReplaySession, "contention": ContentionSession}
+
+# ----------------- yük -----------------
+def worker(base, session, t_start, deadline, encoding, out):
+    parts = urlsplit(base)
+    def connect():
+        return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=120)
+    conn = connect()
+    while time.monotonic() < deadline:
+        name, path = session.next()
+        t0 = time.perf_counter()
+        try:
+            conn.request("GET", path, headers={"Accept-Encoding": encoding})
+            resp = conn.getresponse()
+            body = resp.read()
+            status = resp.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = connect()
+            body, status = b"", 0
+        dt = time.perf_counter() - t0
+        out.append((name, t0 - t_start, dt * 1000.0, status, len(body)))
+    conn.close()
+
+def summarize(rows, seconds):
+    t = np.array([r[2] for r in rows])
+    b = np.array([r[4] for r in rows])
+    return {
+        "requests": len(rows),
+        "errors": sum(1 for r in rows if r[3] not in (200, 304)),
+        "rps": round(len(rows) / seconds, 2),
+        "latency_ms": {k: round(float(v), 2) for k, v in (
+            ("p50", np.percentile(t, 50)), ("p95", np.percentile(t, 95)), ("p99", np.percentile(t, 99)),
+            ("mean", t.mean()), ("max", t.max()))},
+        "bytes": {"mean": int(b.mean()), "p95": int(np.percentile(b, 95)), "total": int(b.sum())},
+    }
+
+def run(base, scenario, concurrency, duration, warmup, seed, bbox, encoding):
+    """Dönüş: {"url", "seconds", "total", "endpoints": {uç: summarize}}"""
+    results = []
+    t_start = time.perf_counter()
+    deadline = time.monotonic() + warmup + duration
+    threads = [threading.Thread(target=worker, args=(
+        base, SCENARIOS[scenario](random.Random(seed + i), bbox), t_start, deadline, encoding, results))
+        for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    rows = [r for r in results if r[1] >= warmup]       # ısınma kayıtları atılır
+    seconds = max(time.perf_counter() - t_start - warmup, 1e-9)
+    names = sorted({r[0] for r in rows})
+    return {
+        "url": base,
+        "seconds": round(seconds, 2),
+        "total": summarize(rows, seconds) if rows else None,
+        "endpoints": {n: summarize([r for r in rows if r[0] == n], seconds) for n in names},
+    }
+
+def print_run(name, res):
+    print(f"\n== {name} ({res['url']}) — {res['seconds']} sn")
+    print(f"  {'uç':<22} {'istek':>7} {'hata':>5} {'ist/sn':>8} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'ort bayt':>10}")
+    for ep, s in list(res["endpoints"].items()) + [("TOPLAM", res["total"])]:
+        if s is None:
+            continue
+        lat = s["latency_ms"]
+        print(f"  {ep:<22} {s['requests']:>7} {s['errors']:>5} {s['rps']:>8.1f} {lat['p50']:>9.1f} "
+              f"{lat['p95']:>9.1f} {lat['p99']:>9.1f} {s['bytes']['mean']:>10}")
+
+# ----------------- sunucu / fikstür -----------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def spawn(kind, dsn, log_dir):
+    """Sunucuyu fikstür DSN'iyle başlat, /health yanıt verene kadar bekle. Dönüş: (proc, url)"""
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=dsn, HOST="127.0.0.1", PORT=str(port), DEBUG="0")
+    cmd = [c.format(port=port) for c in SERVERS[kind]]
+    log = open(os.path.join(log_dir, f"server-{kind}.log"), "w")
+    proc = subprocess.Popen(cmd, cwd=BASE, env=env, stdout=log, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            urlopen(url + "/health", timeout=2).read()
+            return proc, url
+        except OSError:
+            if proc.poll() is not None or time.monotonic() > deadline:
+                proc.kill()
+                raise RuntimeError(f"{kind} sunucusu başlamadı (bkz. {log.name})")
+            time.sleep(0.3)
+
+def git_revision():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BASE,
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# ----------------- karşılaştırma -----------------
+def compare(current, baseline, max_regression, floor_ms=1.0):
+    """Ortak çalıştırma/uçlarda p50/p95 farkı. Dönüş: gerileyen (çalıştırma, uç) listesi."""
+    regressions = []
+    print(f"\n== Karşılaştırma: {baseline['meta'].get('label')} -> {current['meta'].get('label')}")
+    for run_name, res in current["runs"].items():
+        base = baseline["runs"].get(run_name)
+        if not base:
+            continue
+        for ep, s in res["endpoints"].items():
+            b = base["endpoints"].get(ep)
+            if not b:
+                continue
+            p50, p95 = s["latency_ms"]["p50"], s["latency_ms"]["p95"]
+            b50, b95 = b["latency_ms"]["p50"], b["latency_ms"]["p95"]
+            delta = (p95 - b95) / b95 if b95 else 0.0
+            bad = delta > max_regression and p95 - b95 > floor_ms
+            if bad:
+                regressions.append((run_name, ep))
+            print(f"  {run_name:<8} {ep:<22} p50 {b50:8.1f} -> {p50:8.1f}   p95 {b95:8.1f} -> {p95:8.1f}"
+                  f"   ({delta * 100:+.1f}%){'  GERİLEME' if bad else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="API yük testi / gecikme benchmark'ı")
+    parser.add_argument("--target", action="append", default=[], help="ad=http://host:port (tekrarlanabilir)")
+    parser.add_argument("--serve", action="append", default=[], choices=tuple(SERVERS),
+                        help="sunucuyu fikstüre karşı başlat (tekrarlanabilir)")
+    parser.add_argument("--fixture", choices=("docker", "pgctl"), help="PostGIS fikstürünü başlat + yükle")
+    parser.add_argument("--db", default=None, help="--serve için DSN (fikstür yerine)")
+    parser.add_argument("--scenario", choices=tuple(SCENARIOS), default="replay")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-d", "--duration", type=float, default=30.0, help="hedef başına ölçüm süresi (sn)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="ölçülmeyen ısınma süresi (sn)")
+    parser.add_argument("--bbox", default=",".join(map(str, BBOX)))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--encoding", default="gzip", help="Accept-Encoding (identity: sıkıştırmasız)")
+    parser.add_argument("--label", default=None, help="sonuç etiketi (varsayılan: git revizyonu)")
+    parser.add_argument("--out", default=None, help="sonuç JSON yolu")
+    parser.add_argument("--baseline", default=None,
+                        help="karşılaştırılacak önceki sonuç JSON'u (varsayılan: varsa outputs/bench/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="sonucu outputs/bench/baseline.json'a da yaz")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="izin verilen p95 artışı (oran)")
+    args = parser.parse_args()
+
+    if not args.target and not args.serve:
+        parser.error("--target ya da --serve gerekli")
+    bbox = tuple(float(v) for v in args.bbox.split(","))
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    fixture = None
+    dsn = args.db
+    if args.serve and dsn is None:
+        import bench_fixture
+        dsn = bench_fixture.up(args.fixture or "docker")
+        fixture = bench_fixture.load(dsn)
+        print("[OK] Fikstür:", fixture)
+
+    label = args.label or git_revision() or "local"
+    stamp = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "label": label,
+            "git": git_revision(),
+            "timestamp": stamp.isoformat(timespec="seconds"),
+            "scenario": args.scenario,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "bbox": bbox,
+            "encoding": args.encoding,
+            "fixture": fixture,
+            "host": {"python": platform.python_version(), "platform": platform.platform(),
+                     "cpus": os.cpu_count()},
+        },
+        "runs": {},
+    }
+
+    targets = [(spec.partition("=")[0], spec.partition("=")[2] or spec, None) for spec in args.target]
+    for kind in args.serve:
+        targets.append((kind, None, kind))
+    for name, url, kind in targets:
+        proc = None
+        if kind:
+            proc, url = spawn(kind, dsn, RESULTS_DIR)
+        try:
+            res = run(url, args.scenario, args.concurrency, args.duration, args.warmup,
+                      args.seed, bbox, args.encoding)
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait(timeout=10)
+        report["runs"][name] = res
+        print_run(name, res)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"api-{label}-{stamp:%Y%m%d-%H%M%S}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, ensure_ascii=False)
+    print("\nSonuç:", out)
+
+    baseline_path = args.baseline
+    if baseline_path is None and not args.save_baseline and os.path.exists(BASELINE):
+        baseline_path = BASELINE
+    if args.save_baseline:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+        print("Taban:", BASELINE)
+
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.max_regression):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
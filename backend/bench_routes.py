@@ -0,0 +1,137 @@
+# bench_routes.py — rota sorgusu gecikmesi: ::geography vs UTM 35N (geom_utm)
+#
+# route-to-fire / route-to-assembly'nin ortak çekirdeği (app.nearest_ctes)
+# iki yolla çalıştırılır:
+#   geography -> ST_DWithin / ST_Distance(::geography), KNN 4326'da
+#   metric    -> geom_utm sütununda düzlemsel ST_DWithin / <-> / ST_Distance
+# Noktalar hedef tablonun kapsamından (tohumlu) rastgele seçilir; her nokta
+# iki yolla da sorulur (sıra dönüşümlü). Gecikme p50/p95 ve iki yolun mesafe
+# farkı raporlanır. --explain ile her yolun bir planı (EXPLAIN ANALYZE) basılır;
+# --k N ile route-to-assembly?k=N sorgusunun (app.ROUTE_TO_ASSEMBLY_K) planı da
+# basılır (aday KNN'i ve aday başına yanık KNN'i index'ten mi geliyor).
+#
+# Ölçülmüş sonuç yok: geom_utm yolu eklendiğinde erişilebilir bir PostgreSQL
+# yoktu; UTM yolunun hızlandırdığı henüz doğrulanmadı. İlk koşu (ör.
+# bench_fixture.py veritabanına karşı --db ile) bu karşılaştırmayı üretir.
+#
+# Kullanım:
+#   python bench_routes.py
+#   python bench_routes.py --n 500 --max-km 5 --target fire --explain
+#   python bench_routes.py --target assembly --n 50 --explain --k 5
+
+import time, random, argparse
+import numpy as np
+import psycopg2
+
+from app import (nearest_ctes, DATABASE_URL, POSTGIS_SCHEMA,
+                 BURN_AREAS_TABLE, ASSEMBLY_TABLE, ASSEMBLY_GEOM_COLUMN, METRIC_GEOM_COLUMN,
+                 ROUTE_TO_ASSEMBLY_K, route_metric_column, TABLE_COLUMNS_SQL,
+                 ASSEMBLY_TARGET, BURN_POLYS_TARGET)
+
+def core_sql(table, geom_col, metric_col):
+    return f"""
+    WITH {nearest_ctes(table, geom_col, metric_col)}
+    SELECT (SELECT distance_m FROM line_raw),
+           ST_X((SELECT geometry FROM dest)), ST_Y((SELECT geometry FROM dest));
+    """
+
+def extent(cur, table, geom_col):
+    cur.execute(f"SELECT ST_XMin(e), ST_YMin(e), ST_XMax(e), ST_YMax(e) "
+                f"FROM (SELECT ST_Extent({geom_col})::geometry AS e FROM {table}) s;")
+    return cur.fetchone()
+
+def pct(a, q):
+    return float(np.percentile(a, q)) if len(a) else float("nan")
+
+def bench(cur, table, geom_col, n, max_km, seed, explain):
+    x0, y0, x1, y1 = extent(cur, table, geom_col)
+    # kapsamı her yönde %10 genişlet: hedef dışındaki noktalar da olsun
+    dx, dy = (x1 - x0) * 0.1, (y1 - y0) * 0.1
+    rnd = random.Random(seed)
+    pts = [(rnd.uniform(x0 - dx, x1 + dx), rnd.uniform(y0 - dy, y1 + dy)) for _ in range(n)]
+
+    modes = {"geography": core_sql(table, geom_col, None),
+             "metric": core_sql(table, geom_col, METRIC_GEOM_COLUMN)}
+    times = {m: [] for m in modes}
+    dists = {m: [] for m in modes}
+
+    for sql in modes.values():          # ısınma (plan + sayfa önbelleği)
+        cur.execute(sql, {"lon": pts[0][0], "lat": pts[0][1], "max_km": max_km})
+        cur.fetchone()
+
+    for i, (lon, lat) in enumerate(pts):
+        order = list(modes) if i % 2 == 0 else list(modes)[::-1]
+        for m in order:
+            t0 = time.perf_counter()
+            cur.execute(modes[m], {"lon": lon, "lat": lat, "max_km": max_km})
+            row = cur.fetchone()
+            times[m].append((time.perf_counter() - t0) * 1000.0)
+            dists[m].append(np.nan if row[0] is None else float(row[0]))
+
+    print(f"\n== {table} ({n} nokta, max_km={max_km})")
+    for m in modes:
+        t = np.array(times[m])
+        print(f"  {m:<10} p50 {pct(t, 50):8.2f} ms   p95 {pct(t, 95):8.2f} ms   "
+              f"ort {t.mean():8.2f} ms   {n / (t.sum() / 1000.0):7.1f} sorgu/sn")
+    g, p = np.array(dists["geography"]), np.array(dists["metric"])
+    both = ~np.isnan(g) & ~np.isnan(p)
+    mism = int((np.isnan(g) != np.isnan(p)).sum())
+    if both.any():
+        d = np.abs(p[both] - g[both])
+        rel = d / np.maximum(g[both], 1.0)
+        print(f"  mesafe farkı: ort {d.mean():.2f} m, maks {d.max():.2f} m, "
+              f"maks göreli %{rel.max() * 100:.3f}; sonuç var/yok uyuşmazlığı: {mism}")
+    speedup = pct(np.array(times["geography"]), 50) / max(pct(np.array(times["metric"]), 50), 1e-9)
+    print(f"  p50 hızlanma: x{speedup:.1f}")
+
+    if explain:
+        lon, lat = pts[0]
+        for m, sql in modes.items():
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql, {"lon": lon, "lat": lat, "max_km": max_km})
+            print(f"\n-- EXPLAIN {m}")
+            print("\n".join(r[0] for r in cur.fetchall()))
+
+def explain_k(cur, k, max_km, seed):
+    """route-to-assembly?k= sorgusunun planı (EXPLAIN ANALYZE), toplanma kapsamından bir nokta."""
+    x0, y0, x1, y1 = extent(cur, f'{POSTGIS_SCHEMA}."{ASSEMBLY_TABLE}"', ASSEMBLY_GEOM_COLUMN)
+    rnd = random.Random(seed)
+    params = {"lon": rnd.uniform(x0, x1), "lat": rnd.uniform(y0, y1), "max_km": max_km, "tol": 0.0, "k": k}
+    columns = []
+    for table in (ASSEMBLY_TARGET, BURN_POLYS_TARGET):
+        cur.execute(TABLE_COLUMNS_SQL, {"table": table})
+        columns.append({r[0] for r in cur.fetchall()})
+    query = ROUTE_TO_ASSEMBLY_K[route_metric_column(*columns)]     # API'nin seçeceği sürüm
+    cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + query.sql, params)
+    print(f"\n-- EXPLAIN route-to-assembly?k={k}")
+    print("\n".join(r[0] for r in cur.fetchall()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Rota sorgusu: geography vs UTM 35N benchmark")
+    parser.add_argument("--db", default=DATABASE_URL)
+    parser.add_argument("--n", type=int, default=200, help="nokta sayısı (hedef başına)")
+    parser.add_argument("--max-km", type=float, default=None, help="yakınlık filtresi (km)")
+    parser.add_argument("--target", choices=("fire", "assembly", "both"), default="both")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--explain", action="store_true")
+    parser.add_argument("--k", type=int, default=None, help="--explain: route-to-assembly?k= planı da")
+    args = parser.parse_args()
+
+    targets = []
+    if args.target in ("fire", "both"):
+        targets.append((f'{POSTGIS_SCHEMA}."{BURN_AREAS_TABLE}"', "geometry"))
+    if args.target in ("assembly", "both"):
+        targets.append((f'{POSTGIS_SCHEMA}."{ASSEMBLY_TABLE}"', ASSEMBLY_GEOM_COLUMN))
+
+    conn = psycopg2.connect(args.db)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for table, geom_col in targets:
+                bench(cur, table, geom_col, args.n, args.max_km, args.seed, args.explain)
+            if args.explain and args.k:
+                explain_k(cur, args.k, args.max_km, args.seed)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# burn_distance.py — yanık alanına mesafe rasteri (Öklid mesafe dönüşümü)
+#
+# intersect.py'nin vektör yolu önce yanık maskesini poligonlaştırıp sonra
+# her nokta için en yakın poligonu arıyor. Burada mesafe doğrudan raster
+# üzerinde hesaplanır: yanık maskesinin tersine scipy.ndimage
+# distance_transform_edt (piksel boyutu ile, metre) -> her pikselde en yakın
+# yanık pikseline uzaklık. Sonuç float32 tiled GeoTIFF olarak önbelleğe
+# yazılır; noktaların mesafesi piksel indeksinden (blok blok) okunur.
+#
+# Not: EDT piksel merkezleri arasını ölçer; vektör yolu poligon kenarına
+# ölçtüğünden yarım piksel düşülür (yanık kenarı yaklaşımı). Kalan fark
+# nokta/piksel konumundan gelir (30 m rasterde tipik ±15 m).
+# Bellek: EDT tüm rasteri float64 ister (Landsat sahnesi ~1-2 GB).
+
+import os
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+try:
+    from scipy.ndimage import distance_transform_edt
+except Exception:
+    distance_transform_edt = None
+
+from distance_bands import DISTANCE_TIF, DIST_BANDS, classify_distance, classify_distances
+
+def _classes_tag(burn_classes):
+    return ",".join(str(c) for c in sorted(burn_classes))
+
+def build_distance_raster(class_tif, out_tif=DISTANCE_TIF, burn_classes=(2, 3, 4), block=512):
+    """
+    Sınıf rasterinden yanık maskesi (burn_classes) -> EDT mesafe rasteri (metre, float32).
+    Sınıf rasterinin nodata pikselleri "yanık değil" sayılır (mesafe yine hesaplanır).
+    """
+    if distance_transform_edt is None:
+        raise RuntimeError("Raster mesafe modu için scipy gerekli (pip install scipy).")
+    with rasterio.open(class_tif) as src:
+        classes = src.read(1)
+        profile = src.profile.copy()
+        pix_w, pix_h = abs(src.transform.a), abs(src.transform.e)
+
+    mask = np.isin(classes, list(burn_classes))
+    if not mask.any():
+        raise ValueError("Yanık sınıfı piksel bulunamadı; mesafe rasteri üretilemez.")
+    del classes
+
+    # sıfır olmayan piksellerin en yakın sıfıra uzaklığı -> yanık pikselleri 0
+    dist = distance_transform_edt(~mask, sampling=(pix_h, pix_w))
+    del mask
+    # merkezden merkeze -> yanık pikselinin kenarına (yarım piksel)
+    np.subtract(dist, min(pix_w, pix_h) / 2.0, out=dist)
+    np.maximum(dist, 0.0, out=dist)
+
+    profile.update(
+        driver="GTiff", count=1, dtype="float32", nodata=-1.0,
+        compress="deflate", predictor=3, tiled=True, blockxsize=block, blockysize=block,
+        BIGTIFF="IF_SAFER",
+    )
+    profile.pop("photometric", None)
+    tmp = out_tif + ".tmp"
+    with rasterio.open(tmp, "w", **profile) as dst:
+        for r0 in range(0, dist.shape[0], block):
+            part = dist[r0:r0 + block].astype("float32")
+            dst.write(part, 1, window=Window(0, r0, part.shape[1], part.shape[0]))
+        dst.update_tags(BURN_CLASSES=_classes_tag(burn_classes),
+                        SOURCE=os.path.basename(class_tif))
+    os.replace(tmp, out_tif)
+    return out_tif
+
+def ensure_distance_raster(class_tif, out_tif=DISTANCE_TIF, burn_classes=(2, 3, 4)):
+    """
+    Önbellekteki mesafe rasteri güncelse (sınıf rasterinden yeni, aynı
+    yanık sınıfları) onu kullan; değilse yeniden üret. Dönüş: (yol, yeniden_üretildi)
+    """
+    if os.path.exists(out_tif) and os.path.getmtime(out_tif) >= os.path.getmtime(class_tif):
+        with rasterio.open(out_tif) as ds:
+            if ds.tags().get("BURN_CLASSES") == _classes_tag(burn_classes):
+                return out_tif, False
+    return build_distance_raster(class_tif, out_tif, burn_classes), True
+
+def pixel_index(transform, xs, ys):
+    """Dünya koordinatları -> (satır, sütun) int dizileri (vektörel)."""
+    cols, rows = ~transform * (np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+    return np.floor(rows).astype(np.int64), np.floor(cols).astype(np.int64)
+
+def sample_distances(dist_tif, xs, ys):
+    """
+    Noktaların (raster CRS'inde) mesafe değerleri. Her rasterio bloğu en
+    fazla bir kez okunur. Raster dışı / nodata noktalar -> NaN.
+    """
+    xs = np.asarray(xs, dtype=float)
+    out = np.full(xs.shape, np.nan)
+    with rasterio.open(dist_tif) as src:
+        rows, cols = pixel_index(src.transform, xs, ys)
+        inside = (rows >= 0) & (rows < src.height) & (cols >= 0) & (cols < src.width)
+        bh, bw = src.block_shapes[0]
+        idx = np.nonzero(inside)[0]
+        if idx.size:
+            br, bc = rows[idx] // bh, cols[idx] // bw
+            keys = br * (src.width // bw + 1) + bc
+            order = np.argsort(keys, kind="stable")
+            idx, keys = idx[order], keys[order]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            for s, e in zip(starts, np.r_[starts[1:], idx.size]):
+                sel = idx[s:e]
+                r0, c0 = int(rows[sel[0]] // bh) * bh, int(cols[sel[0]] // bw) * bw
+                blk = src.read(1, window=Window(c0, r0, min(bw, src.width - c0), min(bh, src.height - r0)))
+                out[sel] = blk[rows[sel] - r0, cols[sel] - c0]
+        if src.nodata is not None:
+            out[out == src.nodata] = np.nan
+    return out
@@ -0,0 +1,53 @@
+# dataset_version.py — veri seti versiyon damgası
+#
+# Loader scriptleri bir tabloyu yeniden yazdıktan sonra bump_dataset_version()
+# çağırır; API (app.py) bu tabloyu okuyup önbellek anahtarına / ETag'e katar.
+
+from sqlalchemy import text
+
+VERSION_TABLE = "dataset_versions"
+
+# Veri seti adları: loader'lar bu adla artırır, API aynı adı önbellek anahtarına
+# katar. Tablo adından bağımsızdır (ASSEMBLY_TABLE env ile değişse de aynı kalır).
+BURN_POLYS = "burn_polys"
+BURN_UNION = "_burn_union"
+ASSEMBLY_AREAS = "assembly_areas"
+
+# burn_union.py'nin ürettiği tablolar (API de bu adları kullanır; burada durur
+# ki app.py loader bağımlılıklarını -pandas, shapely- içe aktarmasın)
+UNION_TABLE = "_burn_union"
+UNION_THRESHOLDS = (2, 3, 4)        # class >= k (2: Orta-Düşük ve üstü)
+
+
+def subdivided_table(min_class):
+    return f"{UNION_TABLE}_c{int(min_class)}"
+
+DDL = f"""
+CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (
+    name        text PRIMARY KEY,
+    version     bigint NOT NULL DEFAULT 1,
+    updated_at  timestamptz NOT NULL DEFAULT now()
+);
+"""
+
+BUMP_SQL = f"""
+INSERT INTO {VERSION_TABLE} (name) VALUES (:name)
+ON CONFLICT (name) DO UPDATE
+SET version = {VERSION_TABLE}.version + 1,
+    updated_at = now()
+RETURNING version;
+"""
+
+
+def bump_in_transaction(conn, name):
+    """Açık bir transaction içinde artır (veri değişikliğiyle birlikte commit edilir)."""
+    conn.execute(text(DDL))
+    return conn.execute(text(BUMP_SQL), {"name": name}).scalar()
+
+
+def bump_dataset_version(engine, name):
+    """`name` veri setinin versiyonunu 1 artır (yoksa 1 ile oluştur)."""
+    with engine.begin() as conn:
+        version = bump_in_transaction(conn, name)
+    print(f"[INFO] {name} versiyonu -> {version}")
+    return version
@@ -0,0 +1,201 @@
+# db_pool.py — thread-safe, sınırlı PostgreSQL bağlantı havuzu
+#
+# Her istekte psycopg2.connect() (TCP + auth + backend fork) yerine
+# bağlantılar havuzda tutulur ve tekrar kullanılır.
+#   - min/max boyut, checkout zaman aşımı
+#   - checkout sırasında sağlık kontrolü (kopuk bağlantı atılır, yenisi açılır)
+#   - metrikler: kullanımda, bekleyen, checkout gecikmesi
+#   - configure(conn): her yeni bağlantıda bir kez (ör. PREPARE'ler)
+
+import time
+import threading
+from contextlib import contextmanager
+
+import psycopg2
+import psycopg2.extensions
+
+
+class PoolTimeout(Exception):
+    """Havuzdan belirtilen sürede bağlantı alınamadı."""
+
+
+class ConnectionPool:
+    def __init__(self, dsn, minconn=1, maxconn=10, timeout=5.0,
+                 health_check_interval=30.0, connect_kwargs=None, configure=None):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Geçersiz havuz boyutu (0 <= min <= max, max >= 1).")
+        self.dsn = dsn
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.connect_kwargs = connect_kwargs or {}
+        self.configure = configure
+
+        self._cond = threading.Condition()
+        self._idle = []          # [(conn, son_kullanim_zamani)]
+        self._in_use = set()
+        self._opened = 0         # toplam açık bağlantı (idle + in_use)
+        self._closed = False
+
+        # metrikler
+        self._waiting = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+        for _ in range(minconn):
+            conn = self._connect()
+            self._idle.append((conn, time.monotonic()))
+
+    # ── iç yardımcılar ────────────────────────────────────────────────────────
+    def _open(self):
+        conn = psycopg2.connect(self.dsn, **self.connect_kwargs)
+        if self.configure is not None:
+            try:
+                self.configure(conn)
+            except Exception:
+                conn.close()
+                raise
+        return conn
+
+    def _connect(self):
+        conn = self._open()
+        with self._cond:
+            self._opened += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._opened -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+    def _healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        status = conn.info.transaction_status
+        if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        # Uzun süre boşta kalan bağlantıyı gerçekten yokla
+        if time.monotonic() - last_used >= self.health_check_interval:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except Exception:
+                return False
+        return True
+
+    # ── checkout / checkin ────────────────────────────────────────────────────
+    def getconn(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        t0 = time.monotonic()
+        deadline = t0 + timeout
+
+        while True:
+            conn = None
+            last_used = None
+            must_open = False
+            with self._cond:
+                if self._closed:
+                    raise PoolTimeout("Havuz kapalı.")
+                self._waiting += 1
+                try:
+                    while not self._idle and self._opened >= self.maxconn:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise PoolTimeout(
+                                f"{timeout:.1f} sn içinde veritabanı bağlantısı alınamadı "
+                                f"(max={self.maxconn})."
+                            )
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                else:
+                    # yer ayır; bağlantıyı kilit dışında aç
+                    self._opened += 1
+                    must_open = True
+
+            if must_open:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._cond:
+                        self._opened -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._healthy(conn, last_used):
+                self._discard(conn)
+                continue
+
+            waited = time.monotonic() - t0
+            with self._cond:
+                self._in_use.add(conn)
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            return conn
+
+    def putconn(self, conn, close=False):
+        with self._cond:
+            self._in_use.discard(conn)
+        if not close and not conn.closed:
+            try:
+                # açık transaction bırakılmasın
+                if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                close = True
+        if close or conn.closed or self._closed:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.getconn(timeout)
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.putconn(conn, close=broken)
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+    # ── metrikler ─────────────────────────────────────────────────────────────
+    def stats(self):
+        with self._cond:
+            n = self._checkouts
+            return {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "open": self._opened,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "waiting": self._waiting,
+                "checkouts": n,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+                "checkout_ms_avg": round(self._wait_total / n * 1000.0, 3) if n else 0.0,
+                "checkout_ms_max": round(self._wait_max * 1000.0, 3),
+            }
@@ -0,0 +1,36 @@
+# distance_bands.py — yanığa mesafe bantları (yalnızca numpy)
+#
+# burn_distance.py (EDT mesafe rasteri, rasterio/scipy) ve API (app.py,
+# /api/point-risk) aynı bantları kullanır. API'nin rasterio olmadan
+# başlayabilmesi için bantlar ve mesafe rasterinin varsayılan yolu burada.
+
+import os
+import numpy as np
+
+BASE = os.path.dirname(__file__)
+DISTANCE_TIF = os.path.join(BASE, "outputs", "burn_distance.tif")
+
+# Mesafe bantları (metre) -> etiket
+# sınırlar [min, max) olarak yorumlanır; sıralama önemli
+DIST_BANDS = [
+    (0,    250,   "Çok Yüksek"),
+    (250,  500,   "Yüksek"),
+    (500,  1000,  "Orta"),
+    (1000, 5000,  "Düşük"),
+    (5000, 1e12,  "Güvenli"),
+]
+
+def classify_distance(d):
+    for lo, hi, label in DIST_BANDS:
+        if lo <= d < hi:
+            return label
+    return "Bilinmiyor"
+
+def classify_distances(d):
+    """classify_distance'ın vektörel hâli (DIST_BANDS bitişik [min, max) aralıklar)."""
+    d = np.asarray(d, dtype=float)
+    edges = np.array([lo for lo, _, _ in DIST_BANDS] + [DIST_BANDS[-1][1]])
+    labels = np.array([label for _, _, label in DIST_BANDS] + ["Bilinmiyor"], dtype=object)
+    idx = np.searchsorted(edges, d, side="right") - 1
+    idx[(idx < 0) | (idx >= len(DIST_BANDS)) | ~np.isfinite(d)] = len(DIST_BANDS)
+    return labels[idx]
@@ -4,6 +4,18 @@ import rasterio
 from rasterio.warp import reproject, Resampling
 import matplotlib.pyplot as plt
 
+from dnbr_classes import classify, nbr, class_counts
+
+# 0: gri, 1: sarı, 2: turuncu, 3: kırmızı, 4: koyu kırmızı
+CLASS_CMAP = {
+    0: (190,190,190,255),  # gri
+    1: (255,215,0,255),    # sarı
+    2: (255,140,0,255),    # turuncu
+    3: (220,20,60,255),    # kırmızı
+    4: (128,0,0,255),      # koyu kırmızı
+    255: (0,0,0,0)
+}
+
 # ----------------- yardımcılar -----------------
 def find_band(folder, key):
     """folder içinde adı key (Band5/Band7) içeren ilk TIF dosyasını döndür."""
@@ -37,11 +49,9 @@ def read_and_align(src_path, ref_profile=None, ref_transform=None, ref_shape=Non
         )
         return out, ref_profile, ref_transform, ref_profile["crs"]
 
-def safe_div(a, b):
-    """(a/b) güvenli bölme."""
-    denom = (a + b)
-    out = (a - b) / np.where(np.abs(denom) < 1e-6, np.nan, (a + b))
-    return out
+def safe_div(a, b, out=None):
+    """(a-b)/(a+b) güvenli bölme (bkz. dnbr_classes.nbr)."""
+    return nbr(a, b, out=out)
 
 def classify_dnbr(dnbr):
     """
@@ -51,37 +61,14 @@ def classify_dnbr(dnbr):
       2: Moderate-low               (0.27–0.44)
       3: Moderate-high              (0.44–0.66)
       4: High severity              (>= 0.66)
+    NaN -> 255 (nodata). Tek geçiş: dnbr_classes.classify(..., "usgs5").
     """
-    classes = np.full(dnbr.shape, 255, dtype="uint8")  # 255 = nodata
-    mask = ~np.isnan(dnbr)
-
-    bins = [0.10, 0.27, 0.44, 0.66]
-    # <0.10
-    m0 = mask & (dnbr < bins[0])
-    classes[m0] = 0
-    # 0.10–0.27
-    m1 = mask & (dnbr >= bins[0]) & (dnbr < bins[1])
-    classes[m1] = 1
-    # 0.27–0.44
-    m2 = mask & (dnbr >= bins[1]) & (dnbr < bins[2])
-    classes[m2] = 2
-    # 0.44–0.66
-    m3 = mask & (dnbr >= bins[2]) & (dnbr < bins[3])
-    classes[m3] = 3
-    # >=0.66
-    m4 = mask & (dnbr >= bins[3])
-    classes[m4] = 4
-
-    return classes
+    return classify(dnbr, "usgs5")
 
 def summarize(classes, pix_area_m2):
-    valid = classes != 255
-    out = {}
-    for k in [0,1,2,3,4]:
-        cnt = int(np.sum(classes == k))
-        ha  = cnt * pix_area_m2 / 10000.0
-        out[k] = (cnt, ha)
-    total_pix = int(np.sum(valid))
+    counts = class_counts(classes, "usgs5")
+    out = {k: (cnt, cnt * pix_area_m2 / 10000.0) for k, cnt in counts.items()}
+    total_pix = sum(counts.values())
     total_ha  = total_pix * pix_area_m2 / 10000.0
     return out, total_pix, total_ha
 
@@ -120,12 +107,14 @@ def main():
     nir_a, _, _, _              = read_and_align(b5_after,  ref_profile, ref_transform, ref_shape)
     sw2_a, _, _, _              = read_and_align(b7_after,  ref_profile, ref_transform, ref_shape)
 
-    # NBR = (NIR - SWIR2) / (NIR + SWIR2)
-    nbr_before = safe_div(nir_b, sw2_b)
-    nbr_after  = safe_div(nir_a, sw2_a)
+    # NBR = (NIR - SWIR2) / (NIR + SWIR2) — NIR dizilerinin üzerine (yerinde)
+    nbr_before = safe_div(nir_b, sw2_b, out=nir_b)
+    nbr_after  = safe_div(nir_a, sw2_a, out=nir_a)
+    del sw2_b, sw2_a
 
-    # dNBR = before - after
-    dnbr = nbr_before - nbr_after
+    # dNBR = before - after (yerinde)
+    dnbr = np.subtract(nbr_before, nbr_after, out=nbr_before)
+    del nbr_after, nir_a
 
     # Sınıflandır
     classes = classify_dnbr(dnbr)
@@ -141,15 +130,7 @@ def main():
         from rasterio.enums import ColorInterp
         from rasterio.io import MemoryFile
         # colormap sadece bazı görüntüleyicilerde görünür; yazalım
-        cmap = {
-            0: (190,190,190,255),  # gri
-            1: (255,215,0,255),    # sarı
-            2: (255,140,0,255),    # turuncu
-            3: (220,20,60,255),    # kırmızı
-            4: (128,0,0,255),      # koyu kırmızı
-            255: (0,0,0,0)
-        }
-        dst.write_colormap(1, cmap)
+        dst.write_colormap(1, CLASS_CMAP)
 
     # Hızlı PNG önizleme + lejand
     out_png = os.path.join(out_dir, "dnbr_5class_quicklook.png")
@@ -0,0 +1,104 @@
+# dnbr_classes.py — dNBR scriptlerinin ortak NBR ve sınıflandırma çekirdeği
+#
+# dnbr.py (classify_dnbr), verify_dnbr.py (classify_5) ve dnbr_old.py
+# (reclass_dnbr) her sınıf için ayrı boolean maske kurup çıktıya tek tek
+# yazıyordu (~10 tam raster geçişi). Burada sınıflandırma eşik tablosuna
+# göre rasterin üzerinden tek geçişte yapılır: dizi önbelleğe sığan
+# parçalara (CHUNK) bölünür, her parçada aralık indeksi eşik
+# karşılaştırmalarının toplamıyla (np.digitize ile aynı sonuç, daha hızlı)
+# hazır buffer'lara (out=) yazılır ve LUT ile (np.take(..., out=)) sınıf
+# koduna çevrilir. Geçici bellek CHUNK boyutuyla sınırlıdır.
+
+import numpy as np
+
+# Parça başına eleman sayısı (CPU önbelleğinde kalacak kadar küçük)
+CHUNK = 1 << 16
+
+# Sınıf şemaları:
+#   bins    -> artan eşikler; aralıklar [-inf, b0), [b0, b1), ..., [bn, +inf]
+#   classes -> her aralığın sınıf kodu (len(bins) + 1 adet)
+#   nodata  -> NaN pikseller için kod
+SCHEMES = {
+    # USGS (Key & Benson) 5 sınıf — dnbr.py / verify_dnbr.py
+    "usgs5": {
+        "bins": (0.10, 0.27, 0.44, 0.66),
+        "classes": (0, 1, 2, 3, 4),
+        "nodata": 255,
+        "labels": {0: "Etkilenmemiş", 1: "Düşük", 2: "Orta-Düşük", 3: "Orta-Yüksek", 4: "Yüksek"},
+    },
+    # Eski 4 sınıf — dnbr_old.py (>= 0.44 tek sınıf, NaN -> 0)
+    "legacy4": {
+        "bins": (0.10, 0.27, 0.44),
+        "classes": (0, 1, 2, 3),
+        "nodata": 0,
+        "labels": {0: "Etkilenmemiş", 1: "Hafif", 2: "Orta", 3: "Ağır"},
+    },
+}
+
+def make_scheme(bins, classes=None, nodata=255, labels=None):
+    """Özel eşik tablosu: classes verilmezse 0..len(bins)."""
+    bins = tuple(float(b) for b in bins)
+    if any(b2 <= b1 for b1, b2 in zip(bins, bins[1:])):
+        raise ValueError("bins kesin artan olmalı.")
+    classes = tuple(classes) if classes is not None else tuple(range(len(bins) + 1))
+    if len(classes) != len(bins) + 1:
+        raise ValueError("classes uzunluğu len(bins) + 1 olmalı.")
+    return {"bins": bins, "classes": classes, "nodata": nodata, "labels": labels or {}}
+
+def _tables(scheme, dtype):
+    if isinstance(scheme, str):
+        scheme = SCHEMES[scheme]
+    # Eşikler girdiyle aynı tipte: float32 0.44 == 0.44 karşılaştırması eski kodla aynı kalsın
+    dtype = dtype if np.issubdtype(dtype, np.floating) else np.float64
+    bins = np.array(scheme["bins"], dtype=dtype)
+    # indeks len(bins)+1 -> nodata (NaN)
+    lut = np.array(scheme["classes"] + (scheme["nodata"],), dtype="uint8")
+    return bins, lut
+
+def classify(dnbr, scheme="usgs5", out=None):
+    """
+    dNBR -> uint8 sınıf rasteri, tek geçiş.
+    Aralıklar [-inf, b0), [b0, b1), ..., [bn, +inf]; NaN -> nodata.
+    `out` verilirse (aynı şekil, uint8, C-contiguous) sonuç oraya yazılır.
+    """
+    bins, lut = _tables(scheme, dnbr.dtype)
+    if out is None:
+        out = np.empty(dnbr.shape, dtype="uint8")
+    src = np.ascontiguousarray(dnbr).reshape(-1)
+    dst = out.reshape(-1)
+    n = min(CHUNK, src.size)
+    idx_buf = np.empty(n, dtype="uint8")
+    cmp_buf = np.empty(n, dtype=bool)
+    for s in range(0, src.size, CHUNK):
+        x = src[s:s + CHUNK]
+        idx, cmp = idx_buf[:x.size], cmp_buf[:x.size]
+        idx.fill(0)
+        for b in bins:
+            np.greater_equal(x, b, out=cmp)
+            np.add(idx, cmp, out=idx, casting="unsafe")
+        np.isnan(x, out=cmp)
+        idx[cmp] = len(bins) + 1
+        np.take(lut, idx, out=dst[s:s + CHUNK])
+    return out
+
+def nbr(nir, swir2, out=None, eps=1e-6):
+    """
+    NBR = (NIR - SWIR2) / (NIR + SWIR2); |payda| < eps -> NaN.
+    `out=nir` ile girdinin üzerine yazılabilir (ek tam boy dizi: sadece payda).
+    """
+    denom = np.add(nir, swir2)
+    denom[np.abs(denom) < eps] = np.nan
+    out = np.subtract(nir, swir2, out=out)
+    np.divide(out, denom, out=out)
+    return out
+
+def dnbr(nbr_before, nbr_after, out=None):
+    """dNBR = önce - sonra (`out=nbr_before` ile yerinde)."""
+    return np.subtract(nbr_before, nbr_after, out=out)
+
+def class_counts(classes, scheme="usgs5"):
+    """{sınıf: piksel sayısı} (nodata hariç), tek bincount geçişi."""
+    if isinstance(scheme, str):
+        scheme = SCHEMES[scheme]
+    counts = np.bincount(classes.reshape(-1), minlength=256)
+    return {k: int(counts[k]) for k in sorted(set(scheme["classes"]))}
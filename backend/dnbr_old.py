@@ -7,6 +7,8 @@ from rasterio.features import shapes
 import geopandas as gpd
 from shapely.geometry import shape as shp_shape
 
+from dnbr_classes import classify
+
 def read_band(path):
     src = rasterio.open(path)
     arr = src.read(1).astype("float32")
@@ -27,11 +29,8 @@ def nbr(nir, swir2, eps=1e-6):
     return (nir - swir2) / (nir + swir2 + eps)
 
 def reclass_dnbr(dnbr_arr):
-    classes = np.zeros_like(dnbr_arr, dtype="uint8")
-    classes[(dnbr_arr >= 0.10) & (dnbr_arr < 0.27)] = 1
-    classes[(dnbr_arr >= 0.27) & (dnbr_arr < 0.44)] = 2
-    classes[dnbr_arr >= 0.44] = 3
-    return classes
+    # 4 sınıf (0..3), NaN -> 0; ortak çekirdek
+    return classify(dnbr_arr, "legacy4")
 
 def write_raster(path, ref_src, arr, dtype="float32", nodata=None):
     meta = ref_src.meta.copy()
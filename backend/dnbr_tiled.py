@@ -0,0 +1,247 @@
+# dnbr_tiled.py — pencere (tile) bazlı dNBR motoru
+#
+# dnbr.py dört bandı tamamen belleğe okur; tam sahne için birkaç GB gerekir.
+# Burada hizalama (WarpedVRT), NBR/dNBR ve sınıflandırma blok blok yapılır ve
+# tiled GeoTIFF'e yazılır: bellek kullanımı sahne boyutundan bağımsızdır.
+#
+# Yeniden başlatılabilir: tamamlanan bloklar <out>.progress dosyasına yazılır,
+# --resume ile sadece eksik bloklar hesaplanır.
+#
+# Çok çekirdek: --workers N ile bloklar (hizalama, NBR, dNBR, sınıflandırma)
+# bir process havuzuna dağıtılır; sonuçlar sırayla tek yazıcıdan diske gider.
+#
+# Kullanım:
+#   python dnbr_tiled.py                                 # landsat/oncesi + landsat/sonrasi
+#   python dnbr_tiled.py --block 1024 --resume
+#   python dnbr_tiled.py --workers 8
+#   python dnbr_tiled.py --b5-before a.TIF --b7-before b.TIF --b5-after c.TIF --b7-after d.TIF
+
+import os, argparse
+from collections import deque, Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+from rasterio.vrt import WarpedVRT
+from rasterio.warp import Resampling
+
+from dnbr import find_band, CLASS_CMAP
+from dnbr_classes import classify, nbr, class_counts, SCHEMES
+
+SCHEME = "usgs5"
+NODATA = SCHEMES[SCHEME]["nodata"]
+
+# ----------------- yardımcılar -----------------
+def iter_windows(height, width, block):
+    """Satır-öncelikli (row-major) blok pencereleri."""
+    for row in range(0, height, block):
+        for col in range(0, width, block):
+            yield Window(col, row, min(block, width - col), min(block, height - row))
+
+def open_aligned(path, ref):
+    """
+    `path` rasterini referans grid'e hizalı aç. Aynı grid ise doğrudan
+    dataset; değilse WarpedVRT (bilinear) — reprojeksiyon pencere bazında yapılır.
+    Dönüş: (okunacak dataset, kapatılacak nesneler)
+    """
+    src = rasterio.open(path)
+    if (src.crs == ref.crs and src.transform == ref.transform
+            and src.width == ref.width and src.height == ref.height):
+        return src, [src]
+    vrt = WarpedVRT(
+        src,
+        crs=ref.crs, transform=ref.transform,
+        width=ref.width, height=ref.height,
+        resampling=Resampling.bilinear,
+        dtype="float32", nodata=np.nan,
+    )
+    return vrt, [vrt, src]
+
+def read_window(ds, window):
+    """Pencereyi float32 oku; nodata -> NaN."""
+    arr = ds.read(1, window=window, out_dtype="float32", masked=True)
+    return arr.filled(np.nan)
+
+def compute_window(bands, window):
+    """bands = (nir_b, sw2_b, nir_a, sw2_a) hizalı datasetler -> uint8 sınıf bloğu."""
+    nir_b, sw2_b, nir_a, sw2_a = (read_window(ds, window) for ds in bands)
+    nbr(nir_b, sw2_b, out=nir_b)                    # yerinde NBR
+    nbr(nir_a, sw2_a, out=nir_a)
+    dnbr = np.subtract(nir_b, nir_a, out=nir_b)
+    return classify(dnbr, SCHEME)
+
+def progress_path(out_tif):
+    return out_tif + ".progress"
+
+def load_progress(out_tif):
+    done = set()
+    path = progress_path(out_tif)
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    done.add((int(parts[0]), int(parts[1])))
+    return done
+
+def mark_done(out_tif, keys):
+    with open(progress_path(out_tif), "a") as f:
+        for row, col in keys:
+            f.write(f"{row} {col}\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def output_profile(ref_profile, block):
+    profile = ref_profile.copy()
+    profile.update(
+        driver="GTiff", count=1, dtype="uint8", nodata=NODATA,
+        compress="deflate", tiled=True, blockxsize=block, blockysize=block,
+        BIGTIFF="IF_SAFER",
+    )
+    return profile
+
+# ----------------- paralel -----------------
+_WORKER = {}
+
+def open_bands(paths, ref):
+    """Dört bandı referans grid'e hizalı aç. Dönüş: (bands, closers)"""
+    bands, closers = [], []
+    for path in paths:
+        ds, c = open_aligned(path, ref)
+        bands.append(ds)
+        closers.extend(c)
+    return bands, closers
+
+def _init_worker(paths):
+    # rasterio dataset'leri pickle edilemez: her process kendi handle'larını açar
+    ref = rasterio.open(paths[0])
+    _WORKER["bands"], _WORKER["closers"] = open_bands(paths, ref)
+    _WORKER["closers"].append(ref)
+
+def _compute_in_worker(win):
+    col_off, row_off, width, height = win
+    return compute_window(_WORKER["bands"], Window(col_off, row_off, width, height))
+
+def iter_results(paths, ref, windows, workers=1):
+    """
+    (window, classes) çiftlerini `windows` sırasıyla üret. workers > 1 ise
+    process havuzu; bellek sınırlı kalsın diye en fazla workers*4 blok uçuşta.
+    """
+    if workers <= 1:
+        bands, closers = open_bands(paths, ref)
+        try:
+            for w in windows:
+                yield w, compute_window(bands, w)
+        finally:
+            for c in closers:
+                c.close()
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(paths,)) as ex:
+        inflight = deque()
+        it = iter(windows)
+        for w in it:
+            inflight.append((w, ex.submit(_compute_in_worker, (w.col_off, w.row_off, w.width, w.height))))
+            if len(inflight) >= workers * 4:
+                break
+        while inflight:
+            w, fut = inflight.popleft()
+            classes = fut.result()
+            nxt = next(it, None)
+            if nxt is not None:
+                inflight.append((nxt, ex.submit(
+                    _compute_in_worker, (nxt.col_off, nxt.row_off, nxt.width, nxt.height))))
+            yield w, classes
+
+# ----------------- motor -----------------
+def run(b5_before, b7_before, b5_after, b7_after, out_tif,
+        block=512, resume=False, checkpoint=64, workers=1):
+    """
+    Tüm sahneyi blok blok işle. Her `checkpoint` blokta çıktı kapatılıp
+    (diske yazılır) ilerleme dosyası güncellenir.
+    Dönüş: ({sınıf: piksel sayısı} (dnbr_classes.class_counts), piksel alanı m2)
+    """
+    if block % 16:
+        raise ValueError("block 16'nın katı olmalı (GeoTIFF tile boyutu).")
+    paths = (b5_before, b7_before, b5_after, b7_after)
+
+    with rasterio.open(b5_before) as ref:
+        profile = output_profile(ref.profile, block)
+        pix_area_m2 = abs(ref.transform.a * ref.transform.e)
+        windows = list(iter_windows(ref.height, ref.width, block))
+
+        done = load_progress(out_tif) if resume and os.path.exists(out_tif) else set()
+        if not done:
+            if os.path.exists(progress_path(out_tif)):
+                os.remove(progress_path(out_tif))
+            with rasterio.open(out_tif, "w", **profile) as dst:
+                dst.write_colormap(1, CLASS_CMAP)
+        else:
+            print(f"[INFO] Devam: {len(done)}/{len(windows)} blok zaten hazır.")
+
+        counts = Counter(dict.fromkeys(SCHEMES[SCHEME]["classes"], 0))    # {sınıf: piksel}
+        todo = [w for w in windows if (w.row_off, w.col_off) not in done]
+        pending = []
+        dst = rasterio.open(out_tif, "r+")
+        try:
+            for w in windows:
+                if (w.row_off, w.col_off) in done:
+                    counts.update(class_counts(dst.read(1, window=w), SCHEME))
+
+            for i, (w, classes) in enumerate(iter_results(paths, ref, todo, workers), start=1):
+                dst.write(classes, 1, window=w)
+                counts.update(class_counts(classes, SCHEME))
+                pending.append((w.row_off, w.col_off))
+                if len(pending) >= checkpoint:
+                    dst.close()                 # blokları diske yaz
+                    mark_done(out_tif, pending)
+                    pending = []
+                    dst = rasterio.open(out_tif, "r+")
+                    print(f"  {len(done) + i}/{len(windows)} blok")
+        finally:
+            dst.close()
+            if pending:
+                mark_done(out_tif, pending)
+
+    os.remove(progress_path(out_tif))   # tamamlandı
+    return counts, pix_area_m2
+
+def print_summary(counts, pix_area_m2):
+    print("\nSınıf piksel sayısı ve alan (hektar):")
+    labels = SCHEMES[SCHEME]["labels"]
+    for k in sorted(counts):
+        cnt = counts[k]
+        print(f"  {f'{k} {labels[k]}':<16}: {cnt:>10,} px  |  {cnt * pix_area_m2 / 10000.0:,.1f} ha")
+    print(f"\nToplam geçerli piksel: {sum(counts.values()):,}")
+
+# ----------------- ana akış -----------------
+def main():
+    root = os.getcwd()
+    parser = argparse.ArgumentParser(description="Pencere bazlı dNBR (5 sınıf)")
+    parser.add_argument("--before-dir", default=os.path.join(root, "landsat", "oncesi"))
+    parser.add_argument("--after-dir",  default=os.path.join(root, "landsat", "sonrasi"))
+    parser.add_argument("--b5-before"); parser.add_argument("--b7-before")
+    parser.add_argument("--b5-after");  parser.add_argument("--b7-after")
+    parser.add_argument("--out", default=os.path.join(root, "outputs", "dnbr_5class.tif"))
+    parser.add_argument("--block", type=int, default=512, help="blok kenarı (piksel, 16'nın katı)")
+    parser.add_argument("--checkpoint", type=int, default=64, help="kaç blokta bir diske yazılsın")
+    parser.add_argument("--resume", action="store_true", help="yarım kalan çalışmaya devam et")
+    parser.add_argument("--workers", type=int, default=1, help="paralel process sayısı")
+    args = parser.parse_args()
+
+    b5_before = args.b5_before or find_band(args.before_dir, "Band5")
+    b7_before = args.b7_before or find_band(args.before_dir, "Band7")
+    b5_after  = args.b5_after  or find_band(args.after_dir,  "Band5")
+    b7_after  = args.b7_after  or find_band(args.after_dir,  "Band7")
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+
+    counts, pix_area_m2 = run(
+        b5_before, b7_before, b5_after, b7_after, args.out,
+        block=args.block, resume=args.resume, checkpoint=args.checkpoint,
+        workers=args.workers,
+    )
+    print_summary(counts, pix_area_m2)
+    print(f"TİF:  {args.out}")
+
+if __name__ == "__main__":
+    main()
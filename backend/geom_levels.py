@@ -0,0 +1,110 @@
+# geom_levels.py — önceden hesaplanmış çok çözünürlüklü sadeleştirilmiş geometri
+#
+# Loader'lar yükleme sırasında her tabloya geom_s5 / geom_s20 / geom_s50 /
+# geom_s200 sütunlarını (metre toleransı, 3857'de ST_SimplifyPreserveTopology)
+# yazar. API istenen toleransı en yakın seviyeye yuvarlar ve istek anında
+# geometri işlemi yapmaz.
+#
+# Ayrıca metrik sütun: geom_utm = ST_Transform(geometry, 32635) (UTM 35N,
+# rasterlerin CRS'i). Rota sorguları ::geography yerine bu sütunda düzlemsel
+# ST_DWithin / <-> / ST_Distance yapar; sütunun kendi GiST index'i kullanılır.
+
+from sqlalchemy import text
+
+SIMPLIFY_LEVELS_M = (5, 20, 50, 200)
+
+METRIC_SRID = 32635          # UTM 35N (İzmir: merkez meridyen 27°, ölçek hatası < %0.1)
+METRIC_COLUMN = "geom_utm"
+
+
+def level_column(level_m):
+    return f"geom_s{int(level_m)}"
+
+
+def snap_tolerance(tolerance):
+    """Toleransı (m) en yakın seviyeye yuvarla; None/<=0 -> None (ham geometri)."""
+    if not tolerance or tolerance <= 0:
+        return None
+    return min(SIMPLIFY_LEVELS_M, key=lambda lvl: abs(lvl - tolerance))
+
+
+MISSING_COLUMNS_SQL = """
+    SELECT c FROM unnest(CAST(:cols AS text[])) AS c
+    WHERE NOT EXISTS (
+        SELECT 1 FROM pg_attribute
+        WHERE attrelid = to_regclass(:t) AND attname = c AND NOT attisdropped
+    );
+"""
+
+
+def missing_columns(conn, table, columns):
+    """`table`'da olmayan sütunlar (sırayla)."""
+    rows = conn.execute(text(MISSING_COLUMNS_SQL), {"t": table, "cols": list(columns)}).fetchall()
+    missing = {r[0] for r in rows}
+    return [c for c in columns if c in missing]
+
+
+def ensure_simplified_columns(conn, table, srid=4326):
+    """
+    Seviye sütunlarını yalnızca eksikse ekle. ADD COLUMN IF NOT EXISTS sütun
+    varken de ACCESS EXCLUSIVE alır: canlı tabloda DDL sadece ilk seferde,
+    kısa bir transaction'da çalışmalı (veri güncellemesinden ayrı).
+    """
+    for col in missing_columns(conn, table, [level_column(lvl) for lvl in SIMPLIFY_LEVELS_M]):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} geometry(Geometry, {srid});"))
+
+
+def refresh_simplified(conn, table, geom_col="geometry", srid=4326, where=None, params=None):
+    """
+    Açık bir SQLAlchemy bağlantısında (transaction içinde) seviye sütunlarını
+    doldur (DDL yok; sütunlar ensure_simplified_columns ile oluşur). `where`
+    verilirse yalnızca o satırlar güncellenir.
+    """
+    cond = f"{geom_col} IS NOT NULL" + (f" AND ({where})" if where else "")
+    for lvl in SIMPLIFY_LEVELS_M:
+        col = level_column(lvl)
+        conn.execute(text(f"""
+            UPDATE {table}
+            SET {col} = ST_Transform(
+                ST_SimplifyPreserveTopology(ST_Transform({geom_col}, 3857), {lvl}),
+                {srid}
+            )
+            WHERE {cond};
+        """), params or {})
+
+
+def add_simplified_columns(engine, table, geom_col="geometry", srid=4326):
+    """`table` için tüm seviyelerin sütunlarını oluştur ve doldur."""
+    with engine.begin() as conn:
+        ensure_simplified_columns(conn, table, srid)
+        refresh_simplified(conn, table, geom_col, srid)
+    print(f"[OK] {table}: " + ", ".join(level_column(l) for l in SIMPLIFY_LEVELS_M)
+          + " (tolerans " + "/".join(str(l) for l in SIMPLIFY_LEVELS_M) + " m)")
+
+
+def ensure_metric_column(conn, table):
+    """METRIC_COLUMN'u yalnızca eksikse ekle (bkz. ensure_simplified_columns)."""
+    if missing_columns(conn, table, [METRIC_COLUMN]):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN "
+                          f"{METRIC_COLUMN} geometry(Geometry, {METRIC_SRID});"))
+
+
+def refresh_metric(conn, table, geom_col="geometry", where=None, params=None):
+    """
+    Açık bir SQLAlchemy bağlantısında METRIC_COLUMN sütununu doldur (DDL yok;
+    sütun ensure_metric_column ile oluşur). `where` verilirse yalnızca o satırlar.
+    """
+    cond = f"{geom_col} IS NOT NULL" + (f" AND ({where})" if where else "")
+    conn.execute(text(f"""
+        UPDATE {table}
+        SET {METRIC_COLUMN} = ST_Transform({geom_col}, {METRIC_SRID})
+        WHERE {cond};
+    """), params or {})
+
+
+def add_metric_column(engine, table, geom_col="geometry"):
+    """`table` için METRIC_COLUMN sütununu oluştur ve doldur."""
+    with engine.begin() as conn:
+        ensure_metric_column(conn, table)
+        refresh_metric(conn, table, geom_col)
+    print(f"[OK] {table}: {METRIC_COLUMN} (EPSG:{METRIC_SRID})")
@@ -2,16 +2,24 @@
 # dNBR 5-sınıf rasterdan yanık maskesi üretir, toplanma alanlarını
 # YANIK ALANINA MESAFEYE göre risk bantlarına ayırır.
 # Çıktılar: GeoJSON/CSV + 2 PNG harita
+#
+# Kullanım:
+#   python intersect.py                 # poligon + STRtree (vektör)
+#   python intersect.py --mode raster   # EDT mesafe rasteri (outputs/burn_distance.tif, önbellekli)
 
-import os, warnings
+import os, argparse, warnings
 import numpy as np
 import geopandas as gpd
 import rasterio
-from rasterio.features import shapes
-from shapely.geometry import shape
-from shapely.ops import unary_union, nearest_points
+from shapely import STRtree
 import matplotlib.pyplot as plt
 
+from polygonize_stream import iter_polygons
+from burn_distance import (
+    DIST_BANDS, DISTANCE_TIF, classify_distances,
+    ensure_distance_raster, sample_distances,
+)
+
 warnings.filterwarnings("ignore")
 
 # ----------------- AYARLAR -----------------
@@ -24,15 +32,14 @@ os.makedirs(OUTDIR, exist_ok=True)
 # Hangi sınıflar "yanık" sayılacak?
 BURN_CLASSES = {2, 3, 4}           # istersen {3,4} yap
 
-# Mesafe bantları (metre) -> etiket
-# sınırlar [min, max) olarak yorumlanır; sıralama önemli
-DIST_BANDS = [
-    (0,    250,   "Çok Yüksek"),
-    (250,  500,   "Yüksek"),
-    (500,  1000,  "Orta"),
-    (1000, 5000,  "Düşük"),
-    (5000, 1e12,  "Güvenli"),
-]
+# Poligonlaştırma (polygonize_stream)
+BLOCK_ROWS  = 512                  # şerit yüksekliği (piksel)
+SIEVE_PX    = 0                    # >1 ise bu pikselden küçük yanık lekeleri elenir
+MIN_AREA_M2 = 0.0                  # birleştirme sonrası alan filtresi
+
+# Mesafe hesabı: "vector" -> poligonlaştırma + STRtree en yakın komşu
+#                "raster" -> EDT mesafe rasteri (burn_distance.py, önbellekli)
+DISTANCE_MODE = "vector"
 
 # Harita için nokta limiti
 MAX_PLOT = 20000
@@ -65,11 +72,23 @@ def fix_geoms(gdf):
         g["geometry"] = g.buffer(0)
     return g[~g.geometry.is_empty]
 
-def classify_distance(d):
-    for lo, hi, label in DIST_BANDS:
-        if lo <= d < hi:
-            return label
-    return "Bilinmiyor"
+def nearest_burn(points, burn):
+    """
+    Her nokta için en yakın yanık poligonu: STRtree.query_nearest ile
+    (Python döngüsü yok). Dönüş: dist_m, burn_id (burn satırı), burn_class.
+    """
+    tree = STRtree(burn.geometry.values)
+    (pt_idx, burn_idx), dist = tree.query_nearest(points, return_distance=True, all_matches=False)
+    out_dist = np.full(len(points), np.nan)
+    out_id = np.full(len(points), -1, dtype=np.int64)
+    out_dist[pt_idx] = dist
+    out_id[pt_idx] = burn_idx
+    cls = burn["class"].to_numpy()
+    return {
+        "dist_m": out_dist,
+        "burn_id": out_id,
+        "burn_class": np.where(out_id >= 0, cls[np.clip(out_id, 0, None)], -1),
+    }
 
 def plot_maps(bounds, pts, title_extra=""):
     # Tümü
@@ -107,45 +126,78 @@ def plot_maps(bounds, pts, title_extra=""):
     return out, None
 
 # --------------- ANA -----------------------
-def main():
-    # 1) Rasteri aç ve yanık maskesini poligonlaştır
-    with rasterio.open(RASTER_PATH) as src:
-        arr = src.read(1).astype(float)
-        crs = src.crs
-        nodata = src.nodata
-        bounds = (src.bounds.left, src.bounds.bottom, src.bounds.right, src.bounds.top)
-        trf = src.transform
-
-    if nodata is not None:
-        arr[arr == nodata] = np.nan
-
-    # yanık maskesi
-    burn_mask = np.isin(arr, list(BURN_CLASSES))
-    if not burn_mask.any():
+def load_points(crs):
+    """Toplanma alanlarını oku → raster CRS'inde centroid noktaları."""
+    top = read_shp_robust(TOP_PATH)
+    if top.crs != crs:
+        top = top.to_crs(crs)
+    top = fix_geoms(top)
+    if top.empty:
+        return top
+    pts = top.copy()
+    pts["geometry"] = pts.geometry.centroid
+    return pts
+
+def distances_vector(pts, crs):
+    """Yanık maskesini şerit şerit poligonlaştır + STRtree en yakın komşu."""
+    # dikişler akış sırasında birleştirilir -> poligonlar zaten dissolve edilmiş
+    polys = list(iter_polygons(
+        RASTER_PATH, classes=BURN_CLASSES, block_rows=BLOCK_ROWS,
+        sieve_px=SIEVE_PX, min_area=MIN_AREA_M2,
+    ))
+    if not polys:
         print("UYARI: Yanık sınıfı piksel bulunamadı.")
-    geoms = [shape(g) for g, v in shapes(arr, mask=burn_mask, transform=trf) if np.isfinite(v)]
-    burn = gpd.GeoDataFrame(geometry=geoms, crs=crs)
+    burn = gpd.GeoDataFrame(
+        {"class": [c for _, c in polys]}, geometry=[p for p, _ in polys], crs=crs
+    )
     burn = fix_geoms(burn)
     if burn.empty:
         print("UYARI: Yanık poligonu üretilmedi (mask boş).")
-        return
-    burn_union = unary_union(burn.geometry)
+        return False
+    burn = burn.reset_index(drop=True)
+
+    near = nearest_burn(pts.geometry.values, burn)
+    pts["dist_m"] = near["dist_m"]
+    pts["burn_id"] = near["burn_id"]
+    pts["burn_class"] = near["burn_class"]
+    return True
+
+def distances_raster(pts):
+    """EDT mesafe rasterinden (önbellekli) piksel okuması."""
+    path, rebuilt = ensure_distance_raster(RASTER_PATH, DISTANCE_TIF, BURN_CLASSES)
+    print(f"[INFO] Mesafe rasteri {'üretildi' if rebuilt else 'önbellekten'}: {path}")
+    pts["dist_m"] = sample_distances(path, pts.geometry.x.to_numpy(), pts.geometry.y.to_numpy())
+    n_out = int(np.isnan(pts["dist_m"]).sum())
+    if n_out:
+        print(f"UYARI: {n_out} nokta raster dışında (risk bandı: Bilinmiyor).")
+    return True
+
+# --------------- ANA -----------------------
+def main():
+    parser = argparse.ArgumentParser(description="Toplanma alanları — yanığa mesafe risk bantları")
+    parser.add_argument("--mode", choices=("vector", "raster"), default=DISTANCE_MODE,
+                        help="mesafe hesabı: poligon (vector) veya EDT rasteri (raster)")
+    args = parser.parse_args()
+
+    # 1) Raster bilgileri
+    with rasterio.open(RASTER_PATH) as src:
+        crs = src.crs
+        bounds = (src.bounds.left, src.bounds.bottom, src.bounds.right, src.bounds.top)
 
     # 2) Toplanma alanlarını oku → centroid
-    top = read_shp_robust(TOP_PATH)
-    if top.crs != crs:
-        top = top.to_crs(crs)
-    top = fix_geoms(top)
-    if top.empty:
+    pts = load_points(crs)
+    if pts.empty:
         print("Toplanma alanı boş.")
         return
-    pts = top.copy()
-    pts["geometry"] = pts.geometry.centroid
 
     # 3) distance (metre) + risk bandı
-    dists = pts.geometry.apply(lambda g: g.distance(nearest_points(g, burn_union)[1]))
-    pts["dist_m"] = dists.astype(float)
-    pts["risk_band"] = pts["dist_m"].apply(classify_distance)
+    if args.mode == "raster":
+        done = distances_raster(pts)
+    else:
+        done = distances_vector(pts, crs)
+    if not done:
+        return
+    pts["risk_band"] = classify_distances(pts["dist_m"].to_numpy())
 
     # 4) Çıktılar
     out_geo = os.path.join(OUTDIR, "toplanma_risk_by_distance.geojson")
@@ -157,7 +209,7 @@ def main():
     plot_pts = pts.copy()
     if len(plot_pts) > MAX_PLOT:
         plot_pts = plot_pts.sample(MAX_PLOT, random_state=42)
-    full_png, zoom_png = plot_maps(bounds, plot_pts, title_extra=f"(sınıflar={sorted(BURN_CLASSES)})")
+    full_png, zoom_png = plot_maps(bounds, plot_pts, title_extra=f"(sınıflar={sorted(BURN_CLASSES)}, {args.mode})")
 
     # 5) Özet
     print("\nÖZET — Mesafeye göre risk dağılımı")
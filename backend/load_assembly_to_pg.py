@@ -2,61 +2,89 @@ import os, getpass
 import geopandas as gpd
 from sqlalchemy import create_engine
 from sqlalchemy.engine import URL
-from geoalchemy2 import Geometry
-from sqlalchemy import text
-
-# 🔹 DOSYA YOLUNU KENDİNE GÖRE KONTROL ET
-SRC = r"C:\Users\furka\OneDrive\Masaüstü\afet\data\izmir_toplanma_alanlari.geojson"
-
-
-# Shapefile Türkçe karakterli olabilir → Fiona motorunu kullan
-os.environ["GEOPANDAS_IO_ENGINE"] = "fiona"
-
-print("[INFO] Okunuyor:", SRC)
-gdf = gpd.read_file(SRC)
-print("[OK] Kayıt:", len(gdf), "| CRS:", gdf.crs)
-
-# Geometri sütun adı 'geometry' değilse düzelt
-if gdf.geometry.name != "geometry":
-    gdf = gdf.set_geometry(gdf.geometry.name)
-
-# CRS yoksa 4326 ata; varsa 4326'ya çevir
-if gdf.crs is None:
-    gdf = gdf.set_crs(4326)
-elif gdf.crs.to_epsg() != 4326:
-    gdf = gdf.to_crs(4326)
-
-# Basit geometri onarımı
-try:
-    gdf["geometry"] = gdf.buffer(0)
-except Exception:
-    pass
-
-# 🔹 DB bağlantısı (şifre güvenli sorulsun)
-pw = getpass.getpass("Postgres parolan: ")
-url = URL.create(
-    "postgresql+psycopg2",
-    username="postgres",
-    password=pw,
-    host="localhost",
-    port=5432,
-    database="afet",
-)
-engine = create_engine(url)
-
-# 🔹 PostGIS'e yaz
-gdf.to_postgis(
-    "assembly_areas",
-    engine,
-    if_exists="replace",
-    index=False,
-    dtype={"geometry": Geometry("MULTIPOLYGON", srid=4326)}
-)
-
-# Spatial index
-with engine.begin() as conn:
-    conn.execute(text("""CREATE INDEX IF NOT EXISTS assembly_areas_gix
-                         ON assembly_areas USING GIST (geometry);"""))
-
-
-print("✅ assembly_areas yüklendi.")
+
+from pg_bulk_load import load_layer
+from priority_scores import update_priority, ASSEMBLY_TABLE
+from dataset_version import bump_dataset_version, ASSEMBLY_AREAS, BURN_POLYS
+
+# Repo'daki veri (bench_fixture.py ile aynı dosya); ASSEMBLY_SRC ile değiştirilebilir
+SRC = os.getenv("ASSEMBLY_SRC", os.path.join(os.path.dirname(__file__), "data",
+                                            "izmir_toplanma_alanlari.geojson"))
+
+POLYGON_TYPES = ("Polygon", "MultiPolygon")
+
+
+def prepare_assembly(gdf):
+    """
+    Yüklemeye hazırlık (bu script ve bench_fixture.py ortak kullanır):
+    geometri sütunu 'geometry', CRS 4326, poligonlara buffer(0) onarımı.
+    buffer(0) noktaları / çizgileri boş geometriye çevirir -> yalnızca
+    poligonlara uygulanır. Tablo tipi girdiye göre: hepsi poligon ->
+    MULTIPOLYGON, hepsi nokta -> POINT, karışık -> GEOMETRY.
+    Dönüş: (gdf, geometry_type)
+    """
+    # Geometri sütun adı 'geometry' değilse düzelt
+    if gdf.geometry.name != "geometry":
+        gdf = gdf.rename_geometry("geometry")
+
+    # CRS yoksa 4326 ata; varsa 4326'ya çevir
+    if gdf.crs is None:
+        gdf = gdf.set_crs(4326)
+    elif gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(4326)
+
+    # Basit geometri onarımı (yalnızca poligonlar)
+    poly = gdf.geom_type.isin(POLYGON_TYPES)
+    if poly.any():
+        gdf = gdf.copy()
+        try:
+            gdf.loc[poly, "geometry"] = gdf.loc[poly].buffer(0)
+        except Exception:
+            pass
+
+    if poly.all():
+        geometry_type = "MULTIPOLYGON"
+    elif (gdf.geom_type == "Point").all():
+        geometry_type = "POINT"
+    else:
+        geometry_type = "GEOMETRY"
+    return gdf, geometry_type
+
+
+def main():
+    # Shapefile Türkçe karakterli olabilir → Fiona motorunu kullan
+    os.environ["GEOPANDAS_IO_ENGINE"] = "fiona"
+
+    print("[INFO] Okunuyor:", SRC)
+    gdf = gpd.read_file(SRC)
+    print("[OK] Kayıt:", len(gdf), "| CRS:", gdf.crs)
+
+    gdf, geometry_type = prepare_assembly(gdf)
+    print("[OK] Geometri tipi:", geometry_type)
+
+    # 🔹 DB bağlantısı (şifre güvenli sorulsun)
+    pw = getpass.getpass("Postgres parolan: ")
+    url = URL.create(
+        "postgresql+psycopg2",
+        username="postgres",
+        password=pw,
+        host="localhost",
+        port=5432,
+        database="afet",
+    )
+    engine = create_engine(url)
+
+    # 🔹 PostGIS'e yaz (COPY -> staging -> GiST + ANALYZE -> atomik takas)
+    #    Poligonlar MultiPolygon'a yükseltilir; sonunda versiyon artırılır (API önbelleği / ETag)
+    load_layer(engine, gdf, ASSEMBLY_TABLE, geometry_type=geometry_type, srid=4326,
+               dataset=ASSEMBLY_AREAS)
+
+    # Yanık poligonlarının öncelik skoru en yakın toplanma alanına bağlı -> yeniden hesapla
+    if update_priority(engine):
+        bump_dataset_version(engine, BURN_POLYS)
+
+    print(f"✅ {ASSEMBLY_TABLE} yüklendi.")
+
+
+if __name__ == "__main__":
+    main()
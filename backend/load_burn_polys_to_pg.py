@@ -1,7 +1,11 @@
 from sqlalchemy import create_engine
-from geoalchemy2 import Geometry
 import geopandas as gpd
 
+from pg_bulk_load import load_layer
+from burn_union import build_burn_unions
+from priority_scores import update_priority
+from incremental_ingest import reset_state
+
 # 🔹 Veritabanı bağlantısı (kendi şifreni yaz)
 DB_USER = "postgres"
 DB_PASS = "2323"
@@ -21,7 +25,18 @@ if gdf.crs is None:
 print("CRS:", gdf.crs)
 print("Toplam poligon sayısı:", len(gdf))
 
-# 🔹 PostGIS'e yaz
-gdf.to_postgis("burn_polys", engine, if_exists="replace", index=False, dtype={"geometry": Geometry("POLYGON", srid=4326)})
+# 🔹 PostGIS'e yaz (COPY -> staging -> GiST + ANALYZE -> atomik takas)
+#    + çok çözünürlüklü sadeleştirilmiş geometri (5/20/50/200 m)
+#    + geom_utm (UTM 35N, metrik rota sorguları için)
+#    + ağaçlandırma öncelik skoru (priority, nearest_assembly_km)
+#    + API önbelleği / ETag geçersizleşsin (versiyon artırılır)
+load_layer(engine, gdf, "burn_polys", geometry_type="POLYGON", srid=4326, simplify=True,
+           prepare=update_priority)
+
+# 🔹 Tile hash durumu artık bu tabloya ait değil -> incremental_ingest.py sonraki koşuda tam yükler
+reset_state(engine)
+
+# 🔹 Dissolve: _burn_union (harita) + _burn_union_c2/c3/c4 (ST_Subdivide parçaları, KNN)
+build_burn_unions(engine)
 
 print("✅ burn_polys tablosu PostGIS'e yüklendi.")
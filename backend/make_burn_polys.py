@@ -1,31 +1,27 @@
 import rasterio
-from rasterio.features import shapes
-import numpy as np
-import geopandas as gpd
-from shapely.geometry import shape
+
+from polygonize_stream import iter_polygons, iter_batches, write_gpkg
 
 # GİRDİ/ÇIKTI
 tif = r"C:\Users\furka\OneDrive\Masaüstü\afet\outputs\dnbr_5class.tif"
 out_gpkg = r"C:\Users\furka\OneDrive\Masaüstü\afet\outputs\burn_polys.gpkg"  # tek dosya, sağlam format
 layer = "burn_polys"
 
-with rasterio.open(tif) as src:
-    img = src.read(1)
-    mask = (img >= 2)  # sınıf 2/3/4: etkilenen alanlar
-    results = shapes(img, mask=mask, transform=src.transform)
+BURN_CLASSES = {2, 3, 4}   # sınıf 2/3/4: etkilenen alanlar
+SIEVE_PX = 0               # >1 ise bu pikselden küçük bölgeler elenir (örn. 4)
+MIN_AREA_M2 = 0.0          # dikiş birleştirmesi sonrası alan filtresi
+BLOCK_ROWS = 512           # şerit yüksekliği (piksel)
 
-geoms = []
-vals = []
-for geom, val in results:
-    geoms.append(shape(geom))
-    vals.append(int(val))
+with rasterio.open(tif) as src:
+    crs = src.crs or "EPSG:32635"  # dNBR’ımız UTM35’ti
 
-gdf = gpd.GeoDataFrame({"class": vals}, geometry=geoms, crs="EPSG:32635")  # dNBR’ımız UTM35’ti
-gdf = gdf.explode(ignore_index=True)  # çokgenleri ayır
-# sadeleştir (opsiyonel, dosya boyutunu küçültür):
-gdf["geometry"] = gdf.geometry.buffer(0)
+# Raster şerit şerit poligonlaştırılır; dikişe değen parçalar birleştirilip
+# tamamlanan poligonlar parça parça yazılır (tüm liste bellekte tutulmaz).
+polys = iter_polygons(tif, classes=BURN_CLASSES, block_rows=BLOCK_ROWS,
+                      sieve_px=SIEVE_PX, min_area=MIN_AREA_M2)
+# geçersiz geometri onarımı (buffer(0)) poligon başına
+polys = ((p if p.is_valid else p.buffer(0), c) for p, c in polys)
 
 # WGS84'e çevir (web/DB için iyi pratik)
-gdf = gdf.to_crs(4326)
-gdf.to_file(out_gpkg, layer=layer, driver="GPKG")
-print(f"Yazıldı: {out_gpkg} (layer={layer}), {len(gdf)} parça")
+n = write_gpkg(iter_batches(polys, crs, to_crs=4326), out_gpkg, layer)
+print(f"Yazıldı: {out_gpkg} (layer={layer}), {n} parça")
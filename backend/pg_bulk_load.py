@@ -0,0 +1,207 @@
+# pg_bulk_load.py — COPY tabanlı PostGIS yükleyici (staging + atomik takas)
+#
+# to_postgis(if_exists="replace") satırları SQLAlchemy üzerinden INSERT eder
+# ve canlı tabloyu en başta DROP eder: yükleme boyunca API hata döner.
+# Burada:
+#   1) veri <tablo>__staging tablosuna COPY ... FROM STDIN ile akıtılır
+#      (geometri hex EWKB, parça parça; tüm CSV bellekte kurulmaz)
+#   2) opsiyonel sadeleştirilmiş sütunlar ve metrik (UTM 35N) sütun
+#      (geom_levels) staging'de doldurulur
+#   3) tüm geometri sütunlarına GiST index + ANALYZE
+#   4) tek transaction'da: canlı -> __old, staging -> canlı, __old DROP
+# Okuyucular yalnızca 4. adımdaki kısa kilit süresince bekler, hata görmez.
+# Canlı tabloya bağlı view varsa DROP başarısız olur ve takas geri alınır.
+
+import io
+import numpy as np
+import pandas as pd
+import shapely
+
+from dataset_version import bump_dataset_version
+from geom_levels import (add_simplified_columns, add_metric_column, level_column,
+                         SIMPLIFY_LEVELS_M, METRIC_COLUMN)
+
+COPY_BATCH = 5000          # COPY akışına bir seferde yazılan satır
+COPY_NULL  = r"\N"         # COPY ... NULL işaretçisi (tırnaklı "\N" metni NULL sayılmaz)
+SWAP_LOCK_TIMEOUT = "10s"  # takas sırasında canlı tablo kilidi için en fazla bekleme
+
+
+def _ident(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _pg_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "bigint"
+    if pd.api.types.is_float_dtype(dtype):
+        return "double precision"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "timestamptz" if getattr(dtype, "tz", None) is not None else "timestamp"
+    return "text"
+
+
+class _CopyStream:
+    """Metin parçası üreten iterator'ı copy_expert'in beklediği read(size) arayüzüne bağlar."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buf = ""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buf += chunk
+        if size < 0:
+            out, self._buf = self._buf, ""
+        else:
+            out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+
+def _csv_field(v):
+    """
+    Tek CSV alanı: None -> tırnaksız COPY_NULL, sayı/bool -> tırnaksız, diğer
+    her şey tırnaklı. (csv.QUOTE_NONNUMERIC None'ı "" yazar; COPY onu NULL
+    değil boş metin okur, sayı/zaman sütununda ise COPY'yi düşürür.)
+    """
+    if v is None:
+        return COPY_NULL
+    if isinstance(v, (bool, int, float, np.bool_, np.number)):
+        return str(v)
+    return '"' + str(v).replace('"', '""') + '"'
+
+
+def _csv_chunks(gdf, columns, geom_col, srid, multi):
+    """COPY CSV parçaları (alan biçimi: _csv_field; NaN/NaT -> NULL)."""
+    for start in range(0, len(gdf), COPY_BATCH):
+        part = gdf.iloc[start:start + COPY_BATCH]
+        geoms = part.geometry.to_numpy()
+        if multi:
+            single = shapely.get_type_id(geoms) == 3          # Polygon -> MultiPolygon
+            if single.any():
+                geoms = geoms.copy()
+                geoms[single] = shapely.multipolygons(geoms[single][:, None])
+        wkb = shapely.to_wkb(shapely.set_srid(geoms, srid), hex=True, include_srid=True)
+
+        cols = []
+        for c in columns:
+            s = part[c]
+            vals = s.astype(object).where(s.notna(), None).tolist()
+            if pd.api.types.is_datetime64_any_dtype(s.dtype):
+                vals = [v.isoformat() if v is not None else None for v in vals]
+            cols.append(vals)
+
+        buf = io.StringIO()
+        for i, g in enumerate(wkb):
+            buf.write(",".join([_csv_field(col[i]) for col in cols] + [g]))
+            buf.write("\n")
+        yield buf.getvalue()
+
+
+def copy_rows(cur, gdf, table, geom_col="geometry", geometry_type="GEOMETRY", srid=4326, schema="public"):
+    """Var olan tabloya GeoDataFrame satırlarını COPY ile ekle (commit çağırana ait)."""
+    columns = [c for c in gdf.columns if c != gdf.geometry.name]
+    multi = geometry_type.upper().startswith("MULTIPOLYGON")
+    col_list = ", ".join(_ident(c) for c in columns + [geom_col])
+    cur.copy_expert(
+        f"COPY {_ident(schema)}.{_ident(table)} ({col_list}) FROM STDIN "
+        f"WITH (FORMAT csv, NULL '{COPY_NULL}')",
+        _CopyStream(_csv_chunks(gdf, columns, geom_col, srid, multi)),
+    )
+    return len(gdf)
+
+
+def copy_to_staging(conn, gdf, staging, geom_col="geometry", geometry_type="GEOMETRY", srid=4326, schema="public"):
+    """Staging tablosunu sıfırdan oluştur ve GeoDataFrame'i COPY ile doldur. Dönüş: satır sayısı."""
+    columns = [c for c in gdf.columns if c != gdf.geometry.name]
+    col_defs = [f"{_ident(c)} {_pg_type(gdf[c].dtype)}" for c in columns]
+    col_defs.append(f"{_ident(geom_col)} geometry({geometry_type}, {srid})")
+    target = f"{_ident(schema)}.{_ident(staging)}"
+
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {target};")
+        cur.execute(f"CREATE TABLE {target} ({', '.join(col_defs)});")
+        n = copy_rows(cur, gdf, staging, geom_col, geometry_type, srid, schema)
+    conn.commit()
+    return n
+
+
+def index_and_analyze(conn, table, geom_cols, schema="public", index_cols=()):
+    """Her geometri sütununa GiST, `index_cols` sütunlarına btree index + ANALYZE."""
+    target = f"{_ident(schema)}.{_ident(table)}"
+    with conn.cursor() as cur:
+        for col in geom_cols:
+            cur.execute(f"CREATE INDEX {_ident(f'{table}_{col}_gix')} ON {target} USING GIST ({_ident(col)});")
+        for col in index_cols:
+            cur.execute(f"CREATE INDEX {_ident(f'{table}_{col}_idx')} ON {target} ({_ident(col)});")
+        cur.execute(f"ANALYZE {target};")
+    conn.commit()
+
+
+def swap_tables(conn, staging, live, schema="public"):
+    """
+    staging -> live, tek transaction. Index adları __staging ekini kaybeder
+    (eski tablo önce düşürüldüğünden çakışma olmaz).
+    """
+    old = f"{live}__old"
+    with conn.cursor() as cur:
+        cur.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}';")
+        cur.execute(f"DROP TABLE IF EXISTS {_ident(schema)}.{_ident(old)};")
+        cur.execute(f"ALTER TABLE IF EXISTS {_ident(schema)}.{_ident(live)} RENAME TO {_ident(old)};")
+        cur.execute(f"ALTER TABLE {_ident(schema)}.{_ident(staging)} RENAME TO {_ident(live)};")
+        cur.execute(f"DROP TABLE IF EXISTS {_ident(schema)}.{_ident(old)};")
+        cur.execute("SELECT indexname FROM pg_indexes WHERE schemaname = %s AND tablename = %s;",
+                    (schema, live))
+        for (name,) in cur.fetchall():
+            if not name.startswith(staging):
+                continue
+            cur.execute(f"ALTER INDEX {_ident(schema)}.{_ident(name)} "
+                        f"RENAME TO {_ident(live + name[len(staging):])};")
+    conn.commit()
+
+
+def load_layer(engine, gdf, table, geometry_type="GEOMETRY", srid=4326, schema="public",
+               simplify=False, metric=True, dataset=None, index_cols=(), prepare=None):
+    """
+    GeoDataFrame'i `table` tablosuna yükle (COPY -> staging -> index -> takas).
+    - simplify   -> geom_s5/s20/... sütunlarını da üret (geom_levels)
+    - metric     -> geom_utm (EPSG:32635) sütununu da üret; rota sorguları bunu kullanır
+    - index_cols -> ek btree index'li sütunlar
+    - prepare    -> takastan önce staging üzerinde çalışacak ek adım: prepare(engine, tablo)
+    - dataset  -> takastan sonra versiyonu artırılacak veri seti adı (varsayılan: table)
+    """
+    geom_col = "geometry"
+    if gdf.geometry.name != geom_col:
+        gdf = gdf.rename_geometry(geom_col)
+    staging = f"{table}__staging"
+
+    raw = engine.raw_connection()
+    try:
+        n = copy_to_staging(raw, gdf, staging, geom_col, geometry_type, srid, schema)
+        print(f"[OK] COPY: {n:,} satır -> {schema}.{staging}")
+
+        geom_cols = [geom_col]
+        if simplify:
+            add_simplified_columns(engine, f"{_ident(schema)}.{_ident(staging)}", geom_col, srid)
+            geom_cols += [level_column(lvl) for lvl in SIMPLIFY_LEVELS_M]
+        if metric:
+            add_metric_column(engine, f"{_ident(schema)}.{_ident(staging)}", geom_col)
+            geom_cols.append(METRIC_COLUMN)
+        if prepare is not None:
+            prepare(engine, f"{_ident(schema)}.{_ident(staging)}")
+
+        index_and_analyze(raw, staging, geom_cols, schema, index_cols)
+        swap_tables(raw, staging, table, schema)
+        print(f"[OK] Takas: {schema}.{staging} -> {schema}.{table}")
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+    bump_dataset_version(engine, dataset or table)
+    return n
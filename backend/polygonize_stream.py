@@ -0,0 +1,126 @@
+# polygonize_stream.py — pencere bazlı (akış) poligonlaştırma + dikiş birleştirme
+#
+# make_burn_polys.py / intersect.py tüm rasteri tek seferde shapes() ile
+# poligonlaştırıp Python listelerinde topluyordu; yüksek çözünürlükte yüz
+# binlerce 1 piksellik poligon + dev bir unary_union demekti.
+#
+# Burada raster tam genişlikte satır şeritleri halinde okunur:
+#   1) opsiyonel sieve (küçük bölgeleri komşuya kat) — şerit + halo üzerinde;
+#      halo = sieve boyutu olduğundan elenen bölgeler tüm raster sieve'iyle
+#      aynıdır (çok sınıflı rasterde komşuya katma dikiş yakınında nadiren farklı)
+#   2) shapes() ile şerit poligonları (aynı sınıfın bağlı bölgeleri zaten tek poligon)
+#   3) üst dikişe değen poligonlar bir önceki şeritten taşınanlarla sınıf
+#      bazında birleştirilir (on-the-fly dissolve)
+#   4) alt dikişe değmeyen poligonlar tamamlanmıştır -> hemen yield edilir;
+#      değenler bir sonraki şeride taşınır
+# Bellek: bir şerit + dikişte bekleyen poligonlar.
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window, transform as window_transform
+from rasterio.features import shapes, sieve
+from shapely.geometry import shape
+from shapely.ops import unary_union
+
+def _parts(geom):
+    if geom.is_empty:
+        return []
+    if geom.geom_type == "Polygon":
+        return [geom]
+    return [g for g in getattr(geom, "geoms", []) if g.geom_type == "Polygon" and not g.is_empty]
+
+def iter_polygons(raster_path, classes=None, binary=False, block_rows=512,
+                  sieve_px=0, connectivity=4, min_area=0.0):
+    """
+    Rasteri şerit şerit poligonlaştır; (shapely Polygon, sınıf) üretir (raster CRS'inde).
+    - classes    -> dikkate alınacak piksel değerleri (None: nodata ve 0 hariç hepsi)
+    - binary     -> True ise seçili sınıflar tek maske (sınıf = 1) olarak birleştirilir
+    - sieve_px   -> bu pikselden küçük bölgeleri ele (rasterio.features.sieve)
+    - min_area   -> birleştirme sonrası bu alandan (CRS birimi^2) küçük poligonları at
+    """
+    with rasterio.open(raster_path) as src:
+        nodata = src.nodata
+        height, width = src.height, src.width
+        pix_h = abs(src.transform.e)
+        halo = int(sieve_px) if sieve_px and sieve_px > 1 else 0
+        carry = {}   # sınıf -> alt dikişe değen (tamamlanmamış) poligonlar
+
+        for r0 in range(0, height, block_rows):
+            r1 = min(r0 + block_rows, height)
+            last = r1 >= height
+
+            # halo ile oku, sieve uygula, çekirdeğe kırp
+            h0, h1 = max(0, r0 - halo), min(height, r1 + halo)
+            arr = src.read(1, window=Window(0, h0, width, h1 - h0))
+            if classes is not None:
+                keep = np.isin(arr, list(classes))
+            else:
+                keep = arr != 0
+                if nodata is not None:
+                    keep &= arr != nodata
+            if binary:
+                arr = keep.astype("uint8")
+            else:
+                arr = np.where(keep, arr, 0).astype("uint8" if arr.dtype == np.uint8 else "int32")
+            if halo:
+                arr = sieve(arr, size=int(sieve_px), connectivity=connectivity)
+            arr = arr[r0 - h0: r0 - h0 + (r1 - r0)]
+            mask = arr != 0
+
+            win = Window(0, r0, width, r1 - r0)
+            trf = window_transform(win, src.transform)
+            top_y = trf.f                       # şeridin üst kenarı (dünya koordinatı)
+            bot_y = trf.f + trf.e * (r1 - r0)   # alt kenar
+            eps = pix_h * 0.5
+
+            new = {}
+            if mask.any():
+                for g, v in shapes(arr, mask=mask, transform=trf, connectivity=connectivity):
+                    new.setdefault(int(v), []).append(shape(g))
+
+            current = []
+            for cls in set(new) | set(carry):
+                polys = new.get(cls, [])
+                prev = carry.get(cls, [])
+                if prev:
+                    # üst dikişe değenleri taşınanlarla birleştir
+                    touching = [p for p in polys if p.bounds[3] >= top_y - eps]
+                    rest = [p for p in polys if p.bounds[3] < top_y - eps]
+                    merged = _parts(unary_union(prev + touching)) if touching else prev
+                    polys = rest + merged
+                current.extend((p, cls) for p in polys)
+
+            carry = {}
+            for p, cls in current:
+                if not last and p.bounds[1] <= bot_y + eps:
+                    carry.setdefault(cls, []).append(p)
+                elif not min_area or p.area >= min_area:
+                    yield p, cls
+
+def iter_batches(polys, crs, batch_size=5000, to_crs=None):
+    """(poligon, sınıf) akışını GeoDataFrame parçalarına böl."""
+    import geopandas as gpd
+
+    batch = []
+    for p, cls in polys:
+        batch.append((p, cls))
+        if len(batch) >= batch_size:
+            yield _frame(gpd, batch, crs, to_crs)
+            batch = []
+    if batch:
+        yield _frame(gpd, batch, crs, to_crs)
+
+def _frame(gpd, batch, crs, to_crs):
+    gdf = gpd.GeoDataFrame(
+        {"class": [c for _, c in batch]},
+        geometry=[p for p, _ in batch], crs=crs,
+    )
+    return gdf.to_crs(to_crs) if to_crs is not None else gdf
+
+def write_gpkg(batches, path, layer):
+    """Parçaları GPKG katmanına artımlı yaz (ilk parça dosyayı yeniden oluşturur)."""
+    n = 0
+    for i, gdf in enumerate(batches):
+        gdf.to_file(path, layer=layer, driver="GPKG", mode="w" if i == 0 else "a")
+        n += len(gdf)
+    return n
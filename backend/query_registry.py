@@ -0,0 +1,97 @@
+# query_registry.py — adlandırılmış, sunucu tarafı hazırlanmış sorgular (PREPARE / EXECUTE)
+#
+# Sıcak yoldaki sorgular (route-to-fire / route-to-assembly) her istekte
+# f-string ile yeniden kurulup Postgres'te yeniden parse + plan ediliyordu.
+# Burada:
+#   - SQL metni başlangıçta bir kez kurulur (tablo / sütun adları config'ten)
+#     ve bir adla kaydedilir (register)
+#   - her havuz bağlantısında bir kez PREPARE edilir (ConnectionPool
+#     configure -> prepare; o an hazırlanamayanlar ilk kullanımda)
+#   - istekte yalnızca EXECUTE ad(değerler) gider
+# Şablon psycopg2 %(ad)s biçimindedir; PREPARE metni $n'e çevrilir
+# (to_positional, asyncpg de aynı dönüşümü kullanır). Parametre tipleri
+# şablondaki cast'lerden çıkar (%(lon)s::float8).
+
+import re
+import logging
+import threading
+import weakref
+
+import psycopg2
+
+log = logging.getLogger(__name__)
+
+_PARAM_RE = re.compile(r"%\((\w+)\)s")
+_NAME_RE = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+def to_positional(sql):
+    """%(ad)s -> $n (aynı ad aynı numara), %% -> %. Dönüş: (sql, (ad, ...))"""
+    names = []
+    def sub(m):
+        if m.group(1) not in names:
+            names.append(m.group(1))
+        return f"${names.index(m.group(1)) + 1}"
+    return _PARAM_RE.sub(sub, sql).replace("%%", "%"), tuple(names)
+
+class PreparedQuery:
+    def __init__(self, name, sql):
+        self.name = name
+        self.sql = sql                                  # %(ad)s şablonu (asyncpg, EXPLAIN)
+        text, self.names = to_positional(sql)
+        self.prepare_sql = f"PREPARE {name} AS {text.strip().rstrip(';')}"
+        self.execute_sql = (f"EXECUTE {name} ({', '.join(['%s'] * len(self.names))})"
+                            if self.names else f"EXECUTE {name}")
+
+    def args(self, params):
+        return [params[n] for n in self.names]
+
+class QueryRegistry:
+    def __init__(self):
+        self._queries = {}
+        self._prepared = weakref.WeakKeyDictionary()    # bağlantı -> {hazırlanmış adlar}
+        self._lock = threading.Lock()
+
+    def register(self, name, sql):
+        if not _NAME_RE.match(name):
+            raise ValueError(f"Geçersiz sorgu adı: {name!r}")
+        if name in self._queries:
+            raise ValueError(f"Sorgu zaten kayıtlı: {name}")
+        query = self._queries[name] = PreparedQuery(name, sql)
+        return query
+
+    def __getitem__(self, name):
+        return self._queries[name]
+
+    def _done(self, conn):
+        with self._lock:
+            done = self._prepared.get(conn)
+            if done is None:
+                done = self._prepared[conn] = set()
+            return done
+
+    def prepare(self, conn):
+        """
+        Kayıtlı tüm sorguları bu bağlantıda hazırla (yeni havuz bağlantısı).
+        Hazırlanamayan (ör. henüz yüklenmemiş tablo) atlanır, ilk kullanımda
+        yeniden denenir. PREPARE transaction'a bağlı değildir. Dönüş: conn
+        """
+        done = self._done(conn)
+        for query in self._queries.values():
+            if query.name in done:
+                continue
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(query.prepare_sql)
+                done.add(query.name)
+            except psycopg2.Error as e:
+                log.warning("PREPARE %s başarısız: %s", query.name, str(e).strip())
+            conn.rollback()
+        return conn
+
+    def execute(self, cur, query, params):
+        """EXECUTE ad(...); bu bağlantıda hazırlanmamışsa önce PREPARE."""
+        done = self._done(cur.connection)
+        if query.name not in done:
+            cur.execute(query.prepare_sql)
+            done.add(query.name)
+        cur.execute(query.execute_sql, query.args(params))
@@ -0,0 +1,159 @@
+# raster_lookup.py — PostGIS'e gitmeden rasterden nokta okuma (/api/point-risk)
+#
+# Her istek için rasteri açıp pencere okumak yerine:
+#   - Sıkıştırmasız tiled GeoTIFF -> dosya mmap edilir, tile ofsetleri
+#     (GDAL TIFF BLOCK_OFFSET_x_y) tile başına bir kez okunur; piksel
+#     doğrudan sayfa önbelleğinden okunur. Sayfalar OS'te paylaşıldığından gunicorn
+#     worker'larının her birinde raster kopyası tutulmaz.
+#   - Sıkıştırılmış (deflate vb.) GeoTIFF -> çözülen bloklar byte sınırlı
+#     LRU'da tutulur; yalnızca dokunulan bloklar bellekte.
+# Sıkıştırmasız kopya üretmek için:
+#   python raster_lookup.py outputs/dnbr_5class.tif outputs/dnbr_5class_lookup.tif
+
+import os, sys, mmap, threading
+from collections import OrderedDict
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+try:
+    from pyproj import Transformer
+except Exception:
+    Transformer = None
+
+
+class RasterSampler:
+    def __init__(self, path, cache_bytes=32 << 20):
+        self.path = path
+        self.cache_bytes = cache_bytes
+        self._lock = threading.Lock()
+        self._pid = None
+        self._to_crs = None
+        self._ds = None
+        self._mm = None
+        self._tiles = {}               # (blok satır, blok sütun) -> mmap görünümü
+        self._blocks = OrderedDict()   # (blok satır, blok sütun) -> ndarray (LRU)
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def open(self):
+        # fork sonrası (gunicorn) her process kendi handle'ını açsın
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            ds = rasterio.open(self.path)
+            self.crs, self.transform = ds.crs, ds.transform
+            self._inv = ~ds.transform
+            self._to_crs = None
+            self.width, self.height = ds.width, ds.height
+            self.nodata = ds.nodata
+            self.dtype = np.dtype(ds.dtypes[0])
+            self.bh, self.bw = ds.block_shapes[0]
+            self._ds, self._mm = ds, None
+            self._tiles, self._blocks, self._size = {}, OrderedDict(), 0
+            if ds.compression is None and ds.is_tiled:
+                with open(self.path, "rb") as f:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                order = "<" if self._mm[:2] == b"II" else ">"
+                self.dtype = self.dtype.newbyteorder(order)
+                self._get_block = self._mapped_block
+            else:
+                self._get_block = self._decoded_block
+            self._pid = os.getpid()
+
+    def _mapped_block(self, key):
+        blk = self._tiles.get(key, False)
+        if blk is False:
+            with self._lock:
+                item = self._ds.get_tag_item(f"BLOCK_OFFSET_{key[1]}_{key[0]}", "TIFF", bidx=1)
+            off = int(item or 0)
+            # kopya yok: ndarray doğrudan mmap sayfalarına bakar; 0 -> seyrek (yazılmamış) tile
+            blk = None if off == 0 else np.frombuffer(
+                self._mm, dtype=self.dtype, count=self.bh * self.bw, offset=off).reshape(self.bh, self.bw)
+            self._tiles[key] = blk
+        return blk
+
+    def _decoded_block(self, key):
+        with self._lock:
+            blk = self._blocks.get(key)
+            if blk is not None:
+                self._blocks.move_to_end(key)
+                self.hits += 1
+                return blk
+            self.misses += 1
+            r0, c0 = key[0] * self.bh, key[1] * self.bw
+            blk = self._ds.read(1, window=Window(
+                c0, r0, min(self.bw, self.width - c0), min(self.bh, self.height - r0)))
+            self._blocks[key] = blk
+            self._size += blk.nbytes
+            while self._size > self.cache_bytes and len(self._blocks) > 1:
+                _, old = self._blocks.popitem(last=False)
+                self._size -= old.nbytes
+            return blk
+
+    def from_lonlat(self, lons, lats):
+        """WGS84 lon/lat -> raster CRS (dönüştürücü process başına bir kez kurulur)."""
+        self.open()
+        if self._to_crs is None:
+            if Transformer is not None:
+                self._to_crs = Transformer.from_crs("EPSG:4326", self.crs.to_wkt(), always_xy=True).transform
+            else:
+                from rasterio.warp import transform as warp_transform
+                self._to_crs = lambda xs, ys: warp_transform("EPSG:4326", self.crs, list(xs), list(ys))
+        return self._to_crs(lons, lats)
+
+    def value_at(self, x, y):
+        """Tek nokta (raster CRS'inde); raster dışı / nodata -> None. Numpy dizisi kurulmaz."""
+        self.open()
+        col, row = self._inv * (x, y)
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return None
+        r, c = int(row), int(col)
+        blk = self._get_block((r // self.bh, c // self.bw))
+        if blk is None:
+            return None
+        v = blk[r % self.bh, c % self.bw].item()
+        return None if v == self.nodata or v != v else v
+
+    def sample(self, xs, ys):
+        """Nokta dizileri (raster CRS'inde) -> float dizi; raster dışı / nodata -> NaN."""
+        vals = [self.value_at(x, y) for x, y in zip(xs, ys)]
+        return np.array([np.nan if v is None else v for v in vals], dtype=float)
+
+    def stats(self):
+        return {
+            "path": os.path.basename(self.path),
+            "mode": None if self._pid is None else ("mmap" if self._mm is not None else "block-cache"),
+            "blocks": len(self._tiles) if self._mm is not None else len(self._blocks),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def write_uncompressed(src_path, dst_path, block=256):
+    """mmap okumaya uygun kopya: sıkıştırmasız, tiled, tek bant."""
+    with rasterio.open(src_path) as src:
+        profile = src.profile.copy()
+        profile.update(driver="GTiff", count=1, tiled=True, blockxsize=block, blockysize=block,
+                       BIGTIFF="IF_SAFER")
+        profile.pop("compress", None)
+        profile.pop("predictor", None)
+        with rasterio.open(dst_path, "w", **profile) as dst:
+            for _, w in src.block_windows(1):
+                dst.write(src.read(1, window=w), 1, window=w)
+            try:
+                dst.write_colormap(1, src.colormap(1))
+            except ValueError:
+                pass
+            dst.update_tags(**src.tags())
+    return dst_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        raise SystemExit("Kullanım: python raster_lookup.py <girdi.tif> <çıktı.tif>")
+    print("Yazıldı:", write_uncompressed(sys.argv[1], sys.argv[2]))
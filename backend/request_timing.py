@@ -0,0 +1,256 @@
+# request_timing.py — istek / sorgu süre ölçümü (Server-Timing, /metrics, yavaş sorgu)
+#
+# Bir uç yavaşladığında sürenin nereye gittiğini (havuzdan bağlantı alma,
+# cur.execute, fetch, JSON üretimi, sıkıştırma) görmek için:
+#   - istek başına faz süreleri (contextvar; Flask thread'i ya da asyncio task'ı)
+#     -> Server-Timing başlığı (tarayıcı DevTools > Network > Timing)
+#   - route ve faz başına histogramlar -> Prometheus metin formatı (/metrics);
+#     süreç başına tutulur (her worker ayrı kazınır)
+#   - eşik (SLOW_QUERY_MS) aşan sorgu -> "slow_query" logger'ına uyarı; aynı
+#     sorgu metni için en fazla SLOW_QUERY_EXPLAIN_S'de bir EXPLAIN ANALYZE planı
+#     arka plan thread'inde, ayrı bir bağlantıyla alınıp loglanır (istek beklemez)
+# psycopg2 tarafı: TimedConnection (connection_factory) her cursor'ı
+# sarmalar; route kodu değişmeden execute / fetch* ölçülür.
+
+import time
+import queue
+import hashlib
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import psycopg2.extensions
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASES = ("db-conn", "db-exec", "db-fetch", "encode", "compress")
+
+log = logging.getLogger("slow_query")
+
+_ctx = ContextVar("request_timing", default=None)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# İstek bağlamı
+# ──────────────────────────────────────────────────────────────────────────────
+
+def start(route=None):
+    """Yeni istek bağlamı: {"route", "t0", "phases": {faz: sn}, "active"}"""
+    ctx = {"route": route, "t0": time.perf_counter(), "phases": {}, "active": None}
+    _ctx.set(ctx)
+    return ctx
+
+def current():
+    return _ctx.get()
+
+def add(name, seconds):
+    ctx = _ctx.get()
+    if ctx is not None:
+        ctx["phases"][name] = ctx["phases"].get(name, 0.0) + seconds
+
+@contextmanager
+def phase(name):
+    """Bloğun süresini faza ekle. İç içe ölçümler (ör. havuz sağlık kontrolü) dış faza sayılır."""
+    ctx = _ctx.get()
+    if ctx is None or ctx["active"] is not None:
+        yield
+        return
+    ctx["active"] = name
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        ctx["active"] = None
+        add(name, time.perf_counter() - t0)
+
+def server_timing(ctx):
+    """Server-Timing başlık değeri: faz;dur=ms, ... , total;dur=ms"""
+    parts = [f"{name};dur={sec * 1000.0:.1f}" for name, sec in ctx["phases"].items()]
+    parts.append(f"total;dur={(time.perf_counter() - ctx['t0']) * 1000.0:.1f}")
+    return ", ".join(parts)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Metrikler (Prometheus metin formatı)
+# ──────────────────────────────────────────────────────────────────────────────
+
+class Histogram:
+    def __init__(self, name, help_text, labels, buckets=REQUEST_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help_text, labels, buckets
+        self._series = {}      # label değerleri -> [bucket sayaçları..., toplam, adet]
+        self._lock = threading.Lock()
+
+    def observe(self, values, seconds):
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            s = self._series.get(values)
+            if s is None:
+                s = self._series[values] = [0] * len(self.buckets) + [0.0, 0]
+            if i < len(self.buckets):
+                s[i] += 1
+            s[-2] += seconds
+            s[-1] += 1
+
+    def render(self):
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for values, s in sorted(series.items()):
+            lbl = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, values))
+            cum = 0
+            for le, n in zip(self.buckets, s):
+                cum += n
+                out.append(f'{self.name}_bucket{{{lbl},le="{le}"}} {cum}')
+            out.append(f'{self.name}_bucket{{{lbl},le="+Inf"}} {s[-1]}')
+            out.append(f"{self.name}_sum{{{lbl}}} {s[-2]:.6f}")
+            out.append(f"{self.name}_count{{{lbl}}} {s[-1]}")
+        return out
+
+def _escape(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+REQUEST_SECONDS = Histogram("afet_http_request_duration_seconds",
+                            "HTTP istek süresi (yanıt başlıklarına kadar)", ("route", "method", "status"))
+PHASE_SECONDS = Histogram("afet_http_request_phase_seconds",
+                          "İstek başına faz süresi (db-conn, db-exec, db-fetch, encode, compress)",
+                          ("route", "phase"))
+_slow_total = {}
+_slow_lock = threading.Lock()
+
+def observe(ctx, method, status):
+    route = ctx["route"] or "<unmatched>"
+    REQUEST_SECONDS.observe((route, method, str(status)), time.perf_counter() - ctx["t0"])
+    for name, sec in ctx["phases"].items():
+        PHASE_SECONDS.observe((route, name), sec)
+
+def render_metrics(gauges=None):
+    """Tüm metrikler; gauges: {ad: (açıklama, {etiket_tuple|(): değer})}"""
+    lines = REQUEST_SECONDS.render() + PHASE_SECONDS.render()
+    lines += ["# HELP afet_slow_queries_total SLOW_QUERY_MS eşiğini aşan sorgular",
+              "# TYPE afet_slow_queries_total counter"]
+    with _slow_lock:
+        for route, n in sorted(_slow_total.items()):
+            lines.append(f'afet_slow_queries_total{{route="{_escape(route)}"}} {n}')
+    for name, (help_text, series) in (gauges or {}).items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for labels, value in series.items():
+            lbl = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            lines.append(f"{name}{{{lbl}}} {value}" if lbl else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Yavaş sorgu logu (+ EXPLAIN ANALYZE, arka planda)
+# ──────────────────────────────────────────────────────────────────────────────
+
+class SlowQueryLog:
+    def __init__(self, connect, threshold_ms=500.0, explain_interval_s=300.0, max_queue=16):
+        self.connect = connect                 # () -> yeni psycopg2 bağlantısı (havuz dışı)
+        self.threshold = threshold_ms / 1000.0
+        self.explain_interval = explain_interval_s
+        self._last_explain = {}                # sorgu parmak izi -> monotonic
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def check(self, query, params, seconds):
+        if self.threshold <= 0 or seconds < self.threshold:
+            return
+        if isinstance(query, bytes):
+            query = query.decode("utf-8", "replace")
+        ctx = _ctx.get()
+        route = (ctx or {}).get("route") or "<none>"
+        with _slow_lock:
+            _slow_total[route] = _slow_total.get(route, 0) + 1
+        fp = hashlib.sha1(" ".join(query.split()).encode("utf-8")).hexdigest()[:12]
+        log.warning("yavaş sorgu %.1f ms route=%s sorgu=%s params=%r",
+                    seconds * 1000.0, route, fp, params)
+
+        if not query.lstrip().upper().startswith(("SELECT", "WITH", "EXECUTE")):
+            return                              # yalnızca okuma sorguları (bağlantı da readonly)
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_explain.get(fp)
+            if last is not None and now - last < self.explain_interval:
+                return
+            self._last_explain[fp] = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait((fp, route, query, params))
+        except queue.Full:
+            pass
+
+    def _run(self):
+        conn = None
+        while True:
+            fp, route, query, params = self._queue.get()
+            try:
+                if conn is None or conn.closed:
+                    conn = self.connect()
+                    conn.set_session(readonly=True)
+                with conn.cursor() as cur:
+                    cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + query.strip().rstrip(";"), params)
+                    plan = "\n".join(r[0] for r in cur.fetchall())
+                conn.rollback()
+                log.warning("EXPLAIN ANALYZE route=%s sorgu=%s\n%s\n%s", route, fp, query.strip(), plan)
+            except Exception as e:
+                log.warning("EXPLAIN alınamadı (sorgu=%s): %s", fp, e)
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                    conn = None
+
+_slow_log = None
+
+def configure_slow_log(slow_log):
+    global _slow_log
+    _slow_log = slow_log
+
+def check_slow(query, params, seconds):
+    """psycopg2 dışı sürücüler (asyncpg) için: %(ad)s biçimli sorgu + parametre sözlüğü."""
+    if _slow_log is not None:
+        _slow_log.check(query, params, seconds)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# psycopg2: ölçülen bağlantı / cursor
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _TimedCursorMixin:
+    def execute(self, query, vars=None):
+        t0 = time.perf_counter()
+        try:
+            with phase("db-exec"):
+                return super().execute(query, vars)
+        finally:
+            # named (server-side) cursor'da execute yalnızca DECLARE; iş fetch'te
+            if self.name is None:
+                check_slow(query, vars, time.perf_counter() - t0)
+
+    def fetchone(self):
+        with phase("db-fetch"):
+            return super().fetchone()
+
+    def fetchmany(self, size=None):
+        with phase("db-fetch"):
+            return super().fetchmany(size) if size is not None else super().fetchmany()
+
+    def fetchall(self):
+        with phase("db-fetch"):
+            return super().fetchall()
+
+_timed_classes = {}
+
+def _timed(factory):
+    cls = _timed_classes.get(factory)
+    if cls is None:
+        cls = _timed_classes[factory] = type(f"Timed{factory.__name__}", (_TimedCursorMixin, factory), {})
+    return cls
+
+class TimedConnection(psycopg2.extensions.connection):
+    """connection_factory: istenen cursor sınıfını (RealDictCursor vb.) ölçülen alt sınıfla değiştirir."""
+
+    def cursor(self, *args, **kwargs):
+        factory = kwargs.pop("cursor_factory", None) or self.cursor_factory or psycopg2.extensions.cursor
+        return super().cursor(*args, cursor_factory=_timed(factory), **kwargs)
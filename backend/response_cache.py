@@ -0,0 +1,72 @@
+# response_cache.py — byte sınırlı, thread-safe LRU yanıt önbelleği
+#
+# Anahtar: (route, normalize edilmiş query parametreleri, veri seti versiyonu).
+# Değer: hazır yanıt gövdesi (bytes) + mimetype. Sıkıştırılmış varyantlar
+# (anahtar, "br" | "gzip") ile ayrıca saklanır. Versiyon anahtarın parçası
+# olduğundan loader bir versiyon artırdığında eski kayıtlar kendiliğinden
+# ıskalanır ve LRU ile dışarı itilir.
+
+import threading
+from collections import OrderedDict
+
+
+class LRUBytesCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()   # key -> (body, mimetype)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        return self.get_first((key,))[1]
+
+    def get_first(self, keys):
+        """
+        Sırayla ilk bulunan (anahtar, değer); yoksa (None, None). Tek istek
+        birden çok anahtara (sıkıştırılmış varyant, düz gövde) bakar: sayaçlara
+        bir hit ya da bir miss yazılır.
+        """
+        with self._lock:
+            for key in keys:
+                item = self._data.get(key)
+                if item is not None:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return key, item
+            self.misses += 1
+            return None, None
+
+    def put(self, key, body, mimetype):
+        n = len(body)
+        if n > self.max_bytes:
+            return False            # tek başına sığmayan yanıtı önbelleğe alma
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= len(old[0])
+            self._data[key] = (body, mimetype)
+            self._size += n
+            while self._size > self.max_bytes:
+                _, (b, _) = self._data.popitem(last=False)
+                self._size -= len(b)
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
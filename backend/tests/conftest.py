@@ -0,0 +1,4 @@
+# backend/ betikleri birbirini düz modül adıyla içe aktarır (from pg_bulk_load import ...)
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
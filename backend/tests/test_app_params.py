@@ -0,0 +1,37 @@
+# app.parse_bbox / parse_k: sorgu parametresi doğrulama
+
+import pytest
+
+app = pytest.importorskip("app")
+
+
+@pytest.mark.parametrize("raw, expected, ok", [
+    (None, None, True),
+    ("", None, True),
+    ("26.9,38.3,27.3,38.5", (26.9, 38.3, 27.3, 38.5), True),
+    (" 26.9,38.3,27.3,38.5 ", (26.9, 38.3, 27.3, 38.5), True),
+    ("26.9,38.3,27.3", None, False),
+    ("a,b,c,d", None, False),
+    ("27.3,38.3,26.9,38.5", None, False),      # min > max
+    ("-181,0,0,1", None, False),
+    ("0,-91,1,0", None, False),
+])
+def test_parse_bbox(raw, expected, ok):
+    bbox, err = app.parse_bbox({} if raw is None else {"bbox": raw})
+    assert bbox == expected
+    assert (err is None) == ok
+
+
+@pytest.mark.parametrize("raw, expected, ok", [
+    (None, None, True),
+    ("1", 1, True),
+    (str(app.ASSEMBLY_K_MAX), app.ASSEMBLY_K_MAX, True),
+    ("0", None, False),
+    (str(app.ASSEMBLY_K_MAX + 1), None, False),
+    ("2.5", None, False),
+    ("x", None, False),
+])
+def test_parse_k(raw, expected, ok):
+    k, err = app.parse_k({} if raw is None else {"k": raw})
+    assert k == expected
+    assert (err is None) == ok
@@ -0,0 +1,23 @@
+# distance_bands: vektörel bantlama skaler classify_distance ile aynı
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from distance_bands import classify_distance, classify_distances
+
+CASES = [
+    (0, "Çok Yüksek"), (249.9, "Çok Yüksek"), (250, "Yüksek"), (499.9, "Yüksek"),
+    (500, "Orta"), (1000, "Düşük"), (4999.9, "Düşük"), (5000, "Güvenli"),
+    (1e12, "Bilinmiyor"), (-1, "Bilinmiyor"), (np.nan, "Bilinmiyor"), (np.inf, "Bilinmiyor"),
+]
+
+
+@pytest.mark.parametrize("d, label", CASES)
+def test_classify_distances_table(d, label):
+    assert classify_distances([d])[0] == label
+
+
+def test_vector_matches_scalar():
+    d = [c[0] for c in CASES if np.isfinite(c[0])]
+    assert classify_distances(d).tolist() == [classify_distance(v) for v in d]
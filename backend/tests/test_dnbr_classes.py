@@ -0,0 +1,49 @@
+# dnbr_classes.classify: bench_classify.classify_masks (kaldırılan maske tabanlı kod) ile birebir
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dnbr_classes import classify, class_counts, make_scheme
+from bench_classify import classify_masks
+
+# eşik değerleri ve hemen altları / üstleri: [b_i, b_{i+1}) sınırı
+EDGES = [-1.0, 0.0, 0.0999, 0.10, 0.2699, 0.27, 0.4399, 0.44, 0.6599, 0.66, 1.5, np.nan]
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+def test_classify_matches_mask_reference(dtype):
+    rnd = np.random.default_rng(0)
+    x = rnd.uniform(-0.5, 1.0, size=(97, 131)).astype(dtype)
+    x.flat[::7] = np.nan
+    x.flat[:len(EDGES)] = EDGES
+    assert np.array_equal(classify(x), classify_masks(x))
+
+
+@pytest.mark.parametrize("value, expected", [
+    (-0.2, 0), (0.10, 1), (0.27, 2), (0.44, 3), (0.66, 4), (np.nan, 255),
+])
+def test_classify_usgs5_table(value, expected):
+    assert classify(np.array([value], dtype="float32"))[0] == expected
+
+
+def test_classify_legacy4_nan_is_zero():
+    out = classify(np.array([np.nan, 0.05, 0.5, 2.0]), "legacy4")
+    assert out.tolist() == [0, 0, 3, 3]
+
+
+def test_classify_chunk_boundary_and_out():
+    x = np.linspace(-0.2, 0.9, (1 << 16) + 3)
+    out = np.empty(x.shape, dtype="uint8")
+    assert classify(x, out=out) is out
+    assert np.array_equal(out, classify_masks(x))
+
+
+def test_class_counts_excludes_nodata():
+    classes = np.array([0, 0, 1, 4, 255, 255], dtype="uint8")
+    assert class_counts(classes) == {0: 2, 1: 1, 2: 0, 3: 0, 4: 1}
+
+
+def test_make_scheme_rejects_unsorted_bins():
+    with pytest.raises(ValueError):
+        make_scheme((0.3, 0.1))
@@ -0,0 +1,31 @@
+# query_registry.to_positional: %(ad)s -> $n
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from query_registry import to_positional, QueryRegistry
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT 1", ("SELECT 1", ())),
+    ("SELECT %(a)s, %(b)s", ("SELECT $1, $2", ("a", "b"))),
+    ("SELECT %(a)s::float8 + %(a)s", ("SELECT $1::float8 + $1", ("a",))),
+    ("SELECT %(b)s, %(a)s, %(b)s", ("SELECT $1, $2, $1", ("b", "a"))),
+    ("SELECT 'x%%' || %(a)s", ("SELECT 'x%' || $1", ("a",))),
+])
+def test_to_positional(sql, expected):
+    assert to_positional(sql) == expected
+
+
+def test_prepared_query_args_follow_placeholder_order():
+    q = QueryRegistry().register("q", "SELECT %(lat)s, %(lon)s, %(lat)s;")
+    assert q.prepare_sql == "PREPARE q AS SELECT $1, $2, $1"
+    assert q.execute_sql == "EXECUTE q (%s, %s)"
+    assert q.args({"lon": 1, "lat": 2, "extra": 3}) == [2, 1]
+
+
+@pytest.mark.parametrize("name", ["Bad", "1x", "a-b", ""])
+def test_register_rejects_bad_names(name):
+    with pytest.raises(ValueError):
+        QueryRegistry().register(name, "SELECT 1")
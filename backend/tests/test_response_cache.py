@@ -0,0 +1,48 @@
+# response_cache.LRUBytesCache: bayt sınırı, LRU sırası, sayaçlar
+
+from response_cache import LRUBytesCache
+
+
+def test_evicts_least_recently_used_by_bytes():
+    c = LRUBytesCache(10)
+    c.put("a", b"1234", "x")
+    c.put("b", b"1234", "x")
+    assert c.get("a") == (b"1234", "x")         # a en yeni
+    c.put("c", b"1234", "x")                    # 12 > 10 -> b çıkar
+    assert c.get("b") is None
+    assert c.get("a") is not None and c.get("c") is not None
+    st = c.stats()
+    assert (st["entries"], st["bytes"], st["evictions"]) == (2, 8, 1)
+
+
+def test_replace_updates_size():
+    c = LRUBytesCache(10)
+    c.put("a", b"12345678", "x")
+    c.put("a", b"12", "y")
+    assert c.stats()["bytes"] == 2
+    assert c.get("a") == (b"12", "y")
+
+
+def test_oversized_body_is_not_stored():
+    c = LRUBytesCache(4)
+    assert c.put("a", b"12345", "x") is False
+    assert c.stats()["entries"] == 0
+
+
+def test_hit_miss_counters_and_clear():
+    c = LRUBytesCache(10)
+    c.put("a", b"1", "x")
+    c.get("a"); c.get("a"); c.get("b")
+    st = c.stats()
+    assert (st["hits"], st["misses"]) == (2, 1)
+    c.clear()
+    assert c.stats()["bytes"] == 0 and c.get("a") is None
+
+
+def test_get_first_counts_once_per_lookup():
+    c = LRUBytesCache(10)
+    c.put("plain", b"1", "x")
+    assert c.get_first([("plain", "br"), "plain"]) == ("plain", (b"1", "x"))
+    assert c.get_first([("other", "br"), "other"]) == (None, None)
+    st = c.stats()
+    assert (st["hits"], st["misses"]) == (1, 1)
@@ -5,6 +5,8 @@ import rasterio
 from rasterio.warp import reproject, Resampling
 import matplotlib.pyplot as plt
 
+from dnbr_classes import classify, nbr
+
 ROOT = os.getcwd()
 OUT  = os.path.join(ROOT, "outputs", "verify")
 os.makedirs(OUT, exist_ok=True)
@@ -34,9 +36,8 @@ def read_and_align(path, ref_prof=None, ref_transform=None, ref_shape=None):
         )
         return out, ref_prof, ref_transform, ref_prof["crs"], ref_shape
 
-def safe_div(a,b):
-    d = (a+b)
-    return (a-b) / np.where(np.abs(d)<1e-6, np.nan, d)
+def safe_div(a, b, out=None):
+    return nbr(a, b, out=out)
 
 def classify_5(dnbr):
     """
@@ -46,16 +47,9 @@ def classify_5(dnbr):
       2: 0.27–0.44 (Orta-Düşük)
       3: 0.44–0.66 (Orta-Yüksek)
       4: >=0.66   (Yüksek)
+    NaN -> 255. Ortak çekirdek: dnbr_classes.classify(..., "usgs5").
     """
-    classes = np.full(dnbr.shape, 255, dtype="uint8")
-    m = ~np.isnan(dnbr)
-    bins = [0.10, 0.27, 0.44, 0.66]
-    classes[m & (dnbr <  bins[0])] = 0
-    classes[m & (dnbr >= bins[0]) & (dnbr < bins[1])] = 1
-    classes[m & (dnbr >= bins[1]) & (dnbr < bins[2])] = 2
-    classes[m & (dnbr >= bins[2]) & (dnbr < bins[3])] = 3
-    classes[m & (dnbr >= bins[3])] = 4
-    return classes
+    return classify(dnbr, "usgs5")
 
 # ----- dosyaları bul
 B5_BEFORE = pick("*Band5*Haziran*.TIF")
@@ -77,8 +71,8 @@ nir_a, _, _, _, _ = read_and_align(B5_AFTER,  ref_prof, ref_transform, ref_shape
 sw2_a, _, _, _, _ = read_and_align(B7_AFTER,  ref_prof, ref_transform, ref_shape)
 
 # --- NBR before/after ve dNBR
-nbr_before = safe_div(nir_b, sw2_b)
-nbr_after  = safe_div(nir_a, sw2_a)
+nbr_before = safe_div(nir_b, sw2_b, out=nir_b)   # yerinde
+nbr_after  = safe_div(nir_a, sw2_a, out=nir_a)
 dnbr = nbr_before - nbr_after
 classes = classify_5(dnbr)
 
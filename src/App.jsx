@@ -35,35 +35,19 @@ const DefaultIcon = new L.Icon({
 });
 L.Marker.prototype.options.icon = DefaultIcon;
 
-/** ========= Yardımcılar (öncelik hesabı) ========= */
-function haversineKm(a, b) {
-  const R = 6371, toRad = d => (d * Math.PI) / 180;
-  const dLat = toRad(b.lat - a.lat), dLon = toRad(b.lon - a.lon);
-  const s1 = Math.sin(dLat/2) ** 2;
-  const s2 = Math.cos(toRad(a.lat)) * Math.cos(toRad(b.lat)) * Math.sin(dLon/2) ** 2;
-  return 2 * R * Math.asin(Math.sqrt(s1 + s2));
-}
-function centroidOf(feature) {
-  const g = feature?.geometry;
-  if (!g) return null;
-  if (g.type === "Point") return { lon: g.coordinates[0], lat: g.coordinates[1] };
-  if (g.type === "Polygon") {
-    const ring = g.coordinates?.[0]; if (!ring?.length) return null;
-    let sx = 0, sy = 0; for (const [x, y] of ring) { sx += x; sy += y; }
-    return { lon: sx / ring.length, lat: sy / ring.length };
-  }
-  if (g.type === "MultiPolygon") {
-    const ring = g.coordinates?.[0]?.[0]; if (!ring?.length) return null;
-    let sx = 0, sy = 0; for (const [x, y] of ring) { sx += x; sy += y; }
-    return { lon: sx / ring.length, lat: sy / ring.length };
-  }
-  return null;
-}
+/** ========= Yardımcılar (öncelik) ========= */
 function severityWeight(label) {
   if (label === "Yüksek") return 5;
   if (label === "Orta-Yüksek") return 3;
   return 1;
 }
+// Skor backend'de hesaplanır (properties.priority = şiddet ağırlığı + en yakın toplanma alanı bonusu).
+// Yakınlık kapalıyken sadece şiddet ağırlığı kullanılır.
+function priorityOf(feature, withProximity) {
+  const p = feature?.properties || {};
+  if (withProximity && p.priority != null) return p.priority;
+  return severityWeight(p.severity_label || p.severity || "Düşük");
+}
 function colorForPriority(score) {
   if (score >= 8) return "#4B0082";   // çok yüksek
   if (score >= 6) return "#FF0000";   // yüksek
@@ -268,7 +252,6 @@ export default function App() {
   const [selectedBurn, setSelectedBurn] = useState(null);
 
   const [priorityMode, setPriorityMode] = useState(false);
-  const scoreMapRef = useRef(new WeakMap());
 
   const mapRef = useRef(null);
   const lastBboxRef = useRef(null);
@@ -329,37 +312,6 @@ export default function App() {
     } catch (e) { console.error(e); setAssemblyGeo(null); }
   }, [useAssembly]);
 
-  // Öncelik skoru hesap (renkler için skorları WeakMap'e yaz)
-  useEffect(() => {
-    scoreMapRef.current = new WeakMap();
-    if (!burnGeo?.features?.length) return;
-
-    const asmCenters = (assemblyGeo?.features || []).map(f => centroidOf(f)).filter(Boolean);
-
-    for (const f of burnGeo.features) {
-      const p = f.properties || {};
-      const sev = p.severity_label || p.severity || "Düşük";
-      let score = severityWeight(sev);
-      const center = centroidOf(f);
-
-      if (center && asmCenters.length) {
-        let minKm = Infinity;
-        for (const c of asmCenters) {
-          const d = haversineKm({ lat: center.lat, lon: center.lon }, { lat: c.lat, lon: c.lon });
-          if (d < minKm) minKm = d;
-        }
-        const nearestKm = isFinite(minKm) ? minKm : null;
-        if (nearestKm != null) {
-          if (nearestKm < 0.5) score += 10;
-          else if (nearestKm < 1) score += 6;
-          else if (nearestKm < 2.5) score += 3;
-        }
-      }
-
-      scoreMapRef.current.set(f, score);
-    }
-  }, [burnGeo, assemblyGeo, priorityMode]);
-
   // Stil & popup
   const burnStyle = (feature) => {
     if (!priorityMode) {
@@ -367,7 +319,7 @@ export default function App() {
       const color = label && severityColors[label] ? severityColors[label] : "#f59e0b";
       return { color, weight: 1, fillColor: color, fillOpacity: 0.55 };
     }
-    const score = scoreMapRef.current.get(feature) ?? 1;
+    const score = priorityOf(feature, useAssembly);
     const fill = colorForPriority(score);
     return { color: fill, weight: 1, fillColor: fill, fillOpacity: 0.65 };
   };
@@ -385,8 +337,8 @@ export default function App() {
     const p = feature?.properties || {};
     const sev = p.severity_label || p.severity || "—";
     const areaHa = p.area_ha ?? p.area ?? null;
-    const score = scoreMapRef.current.get(feature);
-    const showScore = priorityMode && score != null;
+    const score = priorityOf(feature, useAssembly);
+    const showScore = priorityMode;
 
     const html = `
       <div style="min-width:200px">
@@ -460,7 +412,7 @@ export default function App() {
         {/* Yanık alanlar */}
         {burnGeo && (
           <GeoJSON
-            key={`${priorityMode}-${assemblyGeo?.features?.length || 0}-${burnGeo?.features?.length || 0}`}
+            key={`${priorityMode}-${useAssembly}-${burnGeo?.features?.length || 0}`}
             data={burnGeo}
             style={burnStyle}
             onEachFeature={onEachBurnFeature}